@@ -0,0 +1,337 @@
+"""
+ASGI entry point for serving many clients at once.
+
+Clients waiting on a job, through its lead stream or a ?wait= long-poll,
+are served here as coroutines, so hundreds of them watching long scrapes
+cost no threads. Export downloads are streamed from disk here too, since
+the WSGI bridge has no sendfile path. Every other request goes to the
+Flask app on a pool of WSGI_THREADS threads. Scrapes still run on the job
+queue's workers.
+
+Run with the bundled config:
+    gunicorn -c gunicorn.conf.py asgi:application
+or directly:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import logging
+import os
+import re
+import unicodedata
+from urllib.parse import parse_qsl, quote, urlencode
+
+from a2wsgi import WSGIMiddleware
+from werkzeug.http import (dump_options_header, http_date,
+                           parse_accept_header, parse_range_header,
+                           quote_etag)
+from werkzeug.sansio.http import is_resource_modified
+from werkzeug.utils import get_content_type
+
+from app import (JOB_WAIT_MAX, SSE_HEADERS, SSE_KEEPALIVE, app, broker_stop,
+                 download_mimetype, download_target, driver_pool,
+                 finished_event, job_queue, lead_event)
+from storage import COMPRESSIBLE
+
+logger = logging.getLogger(__name__)
+
+# Threads serving the plain Flask requests; waiting clients use none
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", 16))
+
+# Bytes read from disk per body message of a download
+DOWNLOAD_CHUNK = int(os.environ.get("DOWNLOAD_CHUNK", 256 * 1024))
+
+JOB_PATH = re.compile(r"^/jobs/(?P<job_id>[^/]+)(?P<stream>/stream)?$")
+DOWNLOAD_PATH = re.compile(r"^/download/(?P<filename>[^/]+)$")
+
+wsgi_app = WSGIMiddleware(app, workers=WSGI_THREADS)
+
+
+class JobWaiter:
+    """
+    Wakes a coroutine when its job publishes a lead or finishes, or when
+    the client goes away.
+    """
+
+    def __init__(self, job, receive):
+        self.job = job
+        self.closed = False
+        self._receive = receive
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._watcher = None
+
+    def _wake(self):
+        # Runs on the job's worker thread
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # The event loop has already shut down
+            pass
+
+    async def _watch_disconnect(self):
+        while (await self._receive())["type"] != "http.disconnect":
+            pass
+        self.closed = True
+        self._event.set()
+
+    def __enter__(self):
+        self.job.add_listener(self._wake)
+        self._watcher = asyncio.ensure_future(self._watch_disconnect())
+        return self
+
+    def __exit__(self, *exc_info):
+        self.job.remove_listener(self._wake)
+        self._watcher.cancel()
+
+    async def wait(self, timeout):
+        """Wait for the next change; returns False if `timeout` ran out."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+def _query(scope):
+    return dict(parse_qsl(scope["query_string"].decode("latin1")))
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _send_body(send, text, more_body=True):
+    await send({
+        "type": "http.response.body",
+        "body": text.encode("utf-8"),
+        "more_body": more_body
+    })
+
+
+async def stream_job(job, scope, receive, send):
+    """Async twin of app.job_stream: the same events, without a thread."""
+    headers = dict(scope["headers"])
+    # Reconnecting EventSource clients resume after the last lead they got
+    sent = _int(headers.get(b"last-event-id")) or _int(
+        _query(scope).get("after"))
+
+    await send({
+        "type":
+        "http.response.start",
+        "status":
+        200,
+        "headers": [(b"content-type", b"text/event-stream; charset=utf-8")] +
+        [(k.lower().encode(), v.encode()) for k, v in SSE_HEADERS.items()]
+    })
+    with JobWaiter(job, receive) as waiter:
+        while not waiter.closed:
+            events = []
+            for lead in job.leads[sent:]:
+                sent += 1
+                events.append(lead_event(sent, lead))
+            finished = job.done and sent >= len(job.leads)
+            if finished:
+                events.append(finished_event(job))
+            if events:
+                await _send_body(send, "".join(events), not finished)
+            if finished:
+                return
+            if not await waiter.wait(SSE_KEEPALIVE):
+                await _send_body(send, ": keep-alive\n\n")
+    await _send_body(send, "", more_body=False)
+
+
+async def wait_for_job(job, seconds, receive):
+    """Hold a ?wait= long-poll until the job is done, as a coroutine."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(seconds, JOB_WAIT_MAX)
+    with JobWaiter(job, receive) as waiter:
+        while not job.done and not waiter.closed:
+            remaining = deadline - loop.time()
+            if remaining <= 0 or not await waiter.wait(remaining):
+                break
+
+
+def _content_disposition(filename):
+    """An attachment header for `filename`, the way send_file writes it."""
+    try:
+        filename.encode("ascii")
+        names = {"filename": filename}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", filename)
+        names = {
+            "filename": simple.encode("ascii", "ignore").decode("ascii"),
+            "filename*": f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"
+        }
+    return dump_options_header("attachment", names)
+
+
+def _content_range(headers, etag, last_modified, size):
+    """
+    (start, end) of the requested byte range, None for the whole file, or
+    False if the range cannot be satisfied. An If-Range that no longer
+    matches the file asks for the whole file.
+    """
+    if "range" not in headers or not size:
+        return None
+    if "if-range" in headers and is_resource_modified(
+            http_range=headers["range"],
+            http_if_range=headers["if-range"],
+            etag=etag,
+            last_modified=last_modified,
+            ignore_if_range=False):
+        return None
+    parsed = parse_range_header(headers["range"])
+    span = parsed and parsed.range_for_length(size)
+    return span or False
+
+
+async def send_download(filename, scope, send):
+    """
+    Async twin of app.download: the same headers, ETags and Range handling,
+    with the body read in DOWNLOAD_CHUNK pieces on a thread so the event
+    loop never waits on the disk. Returns False if there is no such
+    export, leaving the 404 to Flask.
+    """
+    headers = {
+        k.decode("latin1"): v.decode("latin1")
+        for k, v in scope["headers"]
+    }
+    accept = parse_accept_header(headers.get("accept-encoding"))
+    target = await asyncio.to_thread(download_target, filename, accept)
+    if target is None:
+        return False
+    path, encoding, etag = target
+    try:
+        file = await asyncio.to_thread(open, path, "rb")
+    except OSError:
+        return False
+
+    with file:
+        stat = os.fstat(file.fileno())
+        size = stat.st_size
+        etag = etag or f"{stat.st_mtime_ns:x}-{size:x}"
+        last_modified = http_date(stat.st_mtime)
+        response_headers = {
+            "content-disposition": _content_disposition(filename),
+            "content-type": get_content_type(
+                download_mimetype(filename) or "application/octet-stream",
+                "utf-8"),
+            "last-modified": last_modified,
+            "cache-control": "no-cache",
+            "etag": quote_etag(etag),
+            "accept-ranges": "bytes"
+        }
+        if encoding:
+            response_headers["content-encoding"] = encoding
+        if path.endswith(COMPRESSIBLE) or encoding:
+            response_headers["vary"] = "Accept-Encoding"
+
+        status, start, end = 200, 0, size
+        span = _content_range(headers, etag, last_modified, size)
+        if not is_resource_modified(
+                http_if_none_match=headers.get("if-none-match"),
+                http_if_modified_since=headers.get("if-modified-since"),
+                etag=etag,
+                last_modified=last_modified):
+            status, end = 304, 0
+            del response_headers["content-type"]
+            del response_headers["last-modified"]
+        elif span is False:
+            status, end = 416, 0
+            response_headers["content-range"] = f"bytes */{size}"
+        elif span:
+            status, (start, end) = 206, span
+            response_headers["content-range"] = (
+                f"bytes {start}-{end - 1}/{size}")
+        if status != 304:
+            response_headers["content-length"] = str(end - start)
+
+        await send({
+            "type":
+            "http.response.start",
+            "status":
+            status,
+            "headers": [(k.encode("latin1"), v.encode("latin1"))
+                        for k, v in response_headers.items()]
+        })
+        if scope["method"] == "HEAD":
+            end = start
+        if start < end:
+            await asyncio.to_thread(file.seek, start)
+        while start < end:
+            chunk = await asyncio.to_thread(file.read,
+                                            min(DOWNLOAD_CHUNK, end - start))
+            if not chunk:
+                # The file shrank since it was opened
+                break
+            start += len(chunk)
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": True
+            })
+    await send({"type": "http.response.body", "body": b""})
+    return True
+
+
+def _replay(message, receive):
+    """A receive callable that hands out `message` before the rest."""
+    pending = [message]
+
+    async def replay():
+        return pending.pop() if pending else await receive()
+
+    return replay
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            broker_stop.set()
+            job_queue.shutdown(wait=False)
+            driver_pool.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+
+    download = DOWNLOAD_PATH.match(scope["path"])
+    if (download and scope["method"] in ("GET", "HEAD")
+            and not app.config["USE_X_SENDFILE"]
+            and await send_download(download["filename"], scope, send)):
+        return
+
+    match = JOB_PATH.match(scope["path"])
+    job = match and scope["method"] == "GET" and job_queue.get(
+        match["job_id"])
+    if job and match["stream"]:
+        return await stream_job(job, scope, receive, send)
+
+    if job:
+        query = _query(scope)
+        try:
+            seconds = float(query.pop("wait", 0))
+        except ValueError:
+            seconds = 0
+        if seconds > 0:
+            # Keep the request message for Flask; the wait then only
+            # listens for a disconnect
+            request = await receive()
+            await wait_for_job(job, seconds, receive)
+            # Flask answers with the finished (or still running) job
+            scope = dict(scope, query_string=urlencode(query).encode())
+            receive = _replay(request, receive)
+
+    # Unknown jobs and everything else are answered by Flask
+    await wsgi_app(scope, receive, send)
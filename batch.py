@@ -0,0 +1,61 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt, base=2.0, cap=60.0):
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def run_batch(combinations,
+              task,
+              workers=2,
+              retries=2,
+              backoff_base=2.0,
+              on_progress=None):
+    """
+    Run `task(combination)` for every combination on a bounded thread pool.
+
+    A task that raises or returns no rows is retried up to `retries` times
+    with jittered exponential backoff. Returns a list of
+    (combination, rows, attempts) tuples in input order, where rows is None
+    if every attempt failed.
+    """
+    outcomes = [None] * len(combinations)
+    collected = 0
+
+    def attempt_all(index):
+        combination = combinations[index]
+        for attempt in range(retries + 1):
+            if attempt:
+                delay = backoff_delay(attempt - 1, base=backoff_base)
+                logger.info(f"Retrying {combination} in {delay:.1f}s "
+                            f"(attempt {attempt + 1})")
+                time.sleep(delay)
+            try:
+                rows = task(combination)
+                if rows:
+                    return index, rows, attempt + 1
+            except Exception as e:
+                logger.error(f"Batch task {combination} failed: {str(e)}")
+        return index, None, retries + 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers),
+                            thread_name_prefix="batch-worker") as executor:
+        futures = [
+            executor.submit(attempt_all, index)
+            for index in range(len(combinations))
+        ]
+        for future in as_completed(futures):
+            index, rows, attempts = future.result()
+            outcomes[index] = (combinations[index], rows, attempts)
+            if rows:
+                collected += len(rows)
+                if on_progress:
+                    on_progress(collected)
+
+    return outcomes
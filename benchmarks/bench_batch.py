@@ -0,0 +1,46 @@
+"""
+Show batch throughput as the worker count grows.
+
+Each simulated search borrows a fake browser from a DriverPool sized to
+the worker count and holds it for --work seconds.
+
+Run from the project root:
+    python -m benchmarks.bench_batch --searches 36 --workers 1 2 4 8
+"""
+import argparse
+import time
+
+from batch import run_batch
+from driver_pool import DriverPool
+from benchmarks.fakes import fake_driver_factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--searches", type=int, default=36)
+    parser.add_argument("--work", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    combinations = [{"search": i} for i in range(args.searches)]
+
+    for workers in args.workers:
+        pool = DriverPool(fake_driver_factory(), size=workers)
+        pool.warm_up()
+
+        def task(combination):
+            with pool.driver() as driver:
+                driver.get("https://www.google.com/maps")
+                time.sleep(args.work)
+            return [combination]
+
+        start = time.perf_counter()
+        run_batch(combinations, task, workers=workers)
+        elapsed = time.perf_counter() - start
+        pool.close()
+        print(f"workers={workers}: {elapsed:.2f}s "
+              f"({args.searches / elapsed:.1f} searches/s)")
+
+
+if __name__ == "__main__":
+    main()
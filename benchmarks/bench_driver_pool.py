@@ -0,0 +1,74 @@
+"""
+Compare a fresh browser per scrape against borrowing from DriverPool.
+
+Run from the project root:
+    python -m benchmarks.bench_driver_pool --startup 0.5 --calls 40 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from driver_pool import DriverPool
+from benchmarks.fakes import fake_driver_factory
+
+
+def simulated_scrape(driver, work):
+    driver.get("https://www.google.com/maps")
+    time.sleep(work)
+
+
+def run_unpooled(factory, calls, workers, work):
+
+    def one_call(_):
+        driver = factory()
+        try:
+            simulated_scrape(driver, work)
+        finally:
+            driver.quit()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(one_call, range(calls)))
+    return time.perf_counter() - start
+
+
+def run_pooled(factory, calls, workers, work, max_uses):
+    pool = DriverPool(factory, size=workers, max_uses=max_uses)
+    pool.warm_up()
+
+    def one_call(_):
+        with pool.driver() as driver:
+            simulated_scrape(driver, work)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(one_call, range(calls)))
+    elapsed = time.perf_counter() - start
+    stats = pool.snapshot()
+    pool.close()
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--startup", type=float, default=0.5)
+    parser.add_argument("--work", type=float, default=0.05)
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-uses", type=int, default=25)
+    args = parser.parse_args()
+
+    factory = fake_driver_factory(startup_delay=args.startup)
+    unpooled = run_unpooled(factory, args.calls, args.workers, args.work)
+    pooled, stats = run_pooled(factory, args.calls, args.workers, args.work,
+                               args.max_uses)
+
+    print(f"unpooled: {unpooled:.2f}s "
+          f"({args.calls / unpooled:.1f} scrapes/s)")
+    print(f"pooled:   {pooled:.2f}s "
+          f"({args.calls / pooled:.1f} scrapes/s)")
+    print(f"pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure website enrichment throughput against a local stand-in server.
+
+Every lead gets its own domain, served by benchmarks.fakes.FakeWebsiteServer
+with `--latency` seconds per response, so throughput should scale with the
+worker count until the server or the client becomes the bottleneck. A second
+pass over the same leads shows the per-domain cache.
+
+Run from the project root:
+    python -m benchmarks.bench_enrich --leads 400 --workers 1 8 32
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fakes import FakeWebsiteServer
+from enrich import EnrichmentCache, WebsiteEnricher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with FakeWebsiteServer(latency=args.latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            leads = [{
+                "name": f"Shop {i}",
+                "website": f"http://www.shop{workers}x{i}.com.co/"
+            } for i in range(args.leads)]
+            cache = EnrichmentCache(os.path.join(tmp, f"cache_{workers}.db"))
+            enricher = WebsiteEnricher(cache=cache,
+                                       workers=workers,
+                                       proxy_url=server.url,
+                                       allow_private=True)
+
+            start = time.perf_counter()
+            enriched = enricher.enrich(leads)
+            cold = time.perf_counter() - start
+            found = sum(1 for lead in enriched if lead["emails"])
+
+            start = time.perf_counter()
+            enricher.enrich(leads)
+            warm = time.perf_counter() - start
+            enricher.close()
+
+            print(f"workers={workers:>3}: {args.leads / cold:8.1f} leads/s "
+                  f"fetching ({found}/{args.leads} with emails), "
+                  f"{args.leads / warm:9.1f} leads/s from cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Time batch extraction of feed cards from the recorded results feed.
+
+Run from the project root:
+    python -m benchmarks.bench_feed_parser --cards 120
+"""
+import argparse
+import os
+import re
+import time
+
+from feed_parser import parse_feed_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_feed(cards):
+    """Repeat the recorded cards until the feed holds `cards` results."""
+    with open(os.path.join(FIXTURES, "maps_feed.html"),
+              encoding="utf-8") as file:
+        html = file.read()
+    head, rest = html.split("\n", 1)
+    blocks = re.findall(r"<div><div class=\"Nv2PK.*?\n<div class=\"TFQHme \"></div>",
+                        rest, re.S)
+    repeated = [blocks[i % len(blocks)] for i in range(cards)]
+    return head + "\n" + "\n".join(repeated) + "\n</div>\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    html = load_feed(args.cards)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        leads = parse_feed_html(html)
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    assert len(leads) == args.cards, len(leads)
+    print(f"parsed {len(leads)} cards in {elapsed * 1000:.1f} ms "
+          f"({len(leads) / elapsed:.0f} cards/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measure run manifest listing latency as runs pile up. /export picks runs
+from the manifest and /leads reads file sizes from it.
+
+After the first (cold) load, each request only parses what was appended
+since the last one, so latency should stay flat from 100 to 10k runs.
+
+Run from the project root:
+    python -m benchmarks.bench_leads_index --runs 100 1000 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from manifest import RunManifest
+
+
+def fill(manifest, runs):
+    for i in range(runs):
+        manifest.append({
+            "filename": f"leads_Peru_Lima_{i:08d}.csv",
+            "query": "Mobile phone shop in Lima, Peru",
+            "country": "Peru",
+            "city": "Lima",
+            "business_type": "Mobile phone shop",
+            "count": 20,
+            "source": "mock",
+            "duration": 1.5,
+            "bytes": 2048,
+            "sha256": "0" * 64,
+            "created_at": "2026-01-01T00:00:00"
+        })
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for runs in args.runs:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "leads_manifest.jsonl")
+            fill(RunManifest(path), runs)
+
+            manifest = RunManifest(path)
+            cold = timed(lambda: manifest.latest(limit=100), 1)
+            warm = timed(lambda: manifest.latest(limit=100), args.repeat)
+
+            def append_then_list():
+                manifest.append({
+                    "filename": f"new_{time.perf_counter_ns()}.csv",
+                    "count": 1,
+                    "created_at": "2026-01-02T00:00:00"
+                })
+                manifest.latest(limit=100)
+
+            incremental = timed(append_then_list, args.repeat)
+            print(f"runs={runs:>6}: cold {cold:7.2f} ms, "
+                  f"warm p50 {warm:5.3f} ms, "
+                  f"after append p50 {incremental:5.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compare page-load time, bytes transferred and memory of a default Chrome
+against lean mode on a live Google Maps search.
+
+Needs a real Chrome and network access (set CHROME_BINARY if selenium
+cannot find Chrome on its own). The first lean pass warms the persistent
+profile's disk cache; later passes show the reuse.
+
+Run from the project root:
+    python -m benchmarks.bench_lean_chrome --query "Cell phone repair in Lima, Peru" --passes 3
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from urllib.parse import quote
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from browser import (BLOCK_PATTERNS, apply_lean_options, block_requests,
+                     blocked_patterns)
+
+TRANSFER_SCRIPT = ("return performance.getEntriesByType('resource')"
+                   ".concat(performance.getEntriesByType('navigation'))"
+                   ".reduce((total, e) => total + (e.transferSize || 0), 0);")
+
+
+def process_tree_rss(root_pid):
+    """Resident memory in MB of a process and all of its descendants."""
+    children = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as file:
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(pid))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def launch(lean, profile_dir):
+    options = Options()
+    for argument in ("--no-sandbox", "--headless", "--disable-dev-shm-usage",
+                     "--disable-gpu"):
+        options.add_argument(argument)
+    options.add_argument(
+        f"--window-size={'1280,900' if lean else '1920,1080'}")
+    if os.environ.get("CHROME_BINARY"):
+        options.binary_location = os.environ["CHROME_BINARY"]
+    if lean:
+        apply_lean_options(options, profile_dir, 256 * 1024 * 1024)
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        block_requests(driver, blocked_patterns(BLOCK_PATTERNS))
+    return driver
+
+
+def one_pass(lean, profile_dir, url):
+    driver = launch(lean, profile_dir)
+    try:
+        start = time.perf_counter()
+        driver.get(url)
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "div[role='feed'], h1")))
+        load = time.perf_counter() - start
+        transferred = driver.execute_script(TRANSFER_SCRIPT) / 1024
+        rss = process_tree_rss(driver.service.process.pid)
+        return load, transferred, rss
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--query",
+                        default="Cell phone repair in Lima, Peru")
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+
+    url = f"https://www.google.com/maps/search/{quote(args.query)}"
+    with tempfile.TemporaryDirectory() as profile_dir:
+        for lean in (False, True):
+            samples = [
+                one_pass(lean, profile_dir, url) for _ in range(args.passes)
+            ]
+            loads, transferred, rss = zip(*samples)
+            print(f"{'lean' if lean else 'default':<8} "
+                  f"load p50 {statistics.median(loads):5.2f}s, "
+                  f"transferred p50 {statistics.median(transferred):8.0f} KB, "
+                  f"RSS p50 {statistics.median(rss):6.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure mock lead throughput of the batched, table-driven generator: as the
+list generate_mock_data returns, as columns, as a row stream and, when
+pyarrow is installed, written to Parquet.
+
+Run from the project root:
+    python -m benchmarks.bench_mock_data --leads 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from mock_data import (generate_mock_data, iter_mock_leads, mock_lead_batches,
+                       write_mock_parquet)
+
+COUNTRY = "Colombia"
+CITY = "Bogotá"
+BUSINESS_TYPE = "Mobile phone shop"
+
+
+def rate(label, leads, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {leads:>9} leads in {elapsed:6.2f}s = "
+          f"{leads / elapsed:>11,.0f} leads/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--list-leads", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rate("list", args.list_leads, lambda: generate_mock_data(
+        COUNTRY, CITY, BUSINESS_TYPE, args.list_leads, seed=args.seed))
+
+    def columns():
+        for _ in mock_lead_batches(COUNTRY, CITY, BUSINESS_TYPE, args.leads,
+                                   args.batch_size, args.seed):
+            pass
+
+    rate("columns", args.leads, columns)
+
+    def rows():
+        for _ in iter_mock_leads(COUNTRY, CITY, BUSINESS_TYPE, args.leads,
+                                 args.batch_size, args.seed):
+            pass
+
+    rate("rows", args.leads, rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mock.parquet")
+        try:
+            rate("parquet", args.leads, lambda: write_mock_parquet(
+                path, COUNTRY, CITY, BUSINESS_TYPE, args.leads,
+                args.batch_size, args.seed))
+        except RuntimeError as e:
+            print(f"parquet    skipped: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
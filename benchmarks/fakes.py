@@ -0,0 +1,360 @@
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from feed_parser import FEED_HTML_SCRIPT
+from payloads import DRAIN_PAYLOADS_SCRIPT, PAYLOAD_PREFIX
+from resume import FEATURE_ID
+from waits import (DETAIL_NAME_SCRIPT, FEED_STATE_SCRIPT,
+                   FEED_VISIBLE_SCRIPT, SEARCH_STATE_SCRIPT)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class FakeDriver:
+    """
+    Minimal stand-in for a Selenium WebDriver.
+
+    Startup cost is simulated in the factory so pooled and unpooled
+    browsers can be compared without launching Chrome.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, crash_after=None):
+        self.id = next(self._ids)
+        self.calls = 0
+        self.crash_after = crash_after
+        self.quit_called = False
+        self.current_url = "about:blank"
+
+    def _tick(self):
+        if self.quit_called:
+            raise RuntimeError("Driver session has been closed")
+        self.calls += 1
+        if self.crash_after is not None and self.calls > self.crash_after:
+            raise RuntimeError("Chrome not reachable")
+
+    def get(self, url):
+        self._tick()
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        self._tick()
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_driver_factory(startup_delay=0.0, crash_after=None):
+    """Return a zero-argument factory compatible with DriverPool."""
+    lock = threading.Lock()
+    created = []
+
+    def factory():
+        time.sleep(startup_delay)
+        driver = FakeDriver(crash_after=crash_after)
+        with lock:
+            created.append(driver)
+        return driver
+
+    factory.created = created
+    return factory
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+        return file.read()
+
+
+def recorded_feed_cards(count):
+    """
+    Return (feed_head, cards, feed_end) from the recorded results feed,
+    with the recorded cards repeated until there are `count` of them.
+
+    Repeats get a numbered name and place URL so each one is a distinct
+    business to the scraper.
+    """
+    html = read_fixture("maps_feed.html")
+    head, rest = html.split("\n", 1)
+    blocks = re.findall(
+        r"<div><div class=\"Nv2PK.*?\n<div class=\"TFQHme \"></div>", rest,
+        re.S)
+    end = rest[rest.rindex(blocks[-1]) + len(blocks[-1]):]
+
+    cards = []
+    for i in range(count):
+        block = blocks[i % len(blocks)]
+        if i >= len(blocks):
+            name = re.search(r'aria-label="([^"]+)"', block).group(1)
+            block = block.replace(name, f"{name} {i}").replace(
+                "/maps/place/", f"/maps/place/{i}/")
+            # Same suffix recorded_places() gives the place's feature id
+            block = FEATURE_ID.sub(rf"\g<0>{i}", block)
+        cards.append(block)
+    return head + "\n", cards, end
+
+
+def recorded_places(count):
+    """
+    Place arrays from the recorded search response, repeated like
+    recorded_feed_cards() so the same businesses come out of both.
+    """
+    text = read_fixture("maps_search_payload.txt")
+    data = json.loads(text.strip()[len(PAYLOAD_PREFIX):])
+    templates = [entry[14] for entry in data[0][1][1:]]
+
+    places = []
+    for i in range(count):
+        place = list(templates[i % len(templates)])
+        if i >= len(templates):
+            place[11] = f"{place[11]} {i}"
+            place[10] = f"{place[10]}{i}"
+        places.append(place)
+    return places
+
+
+def search_payload(query, places):
+    """A search response body carrying `places`."""
+    entries = [[query, None]] + [[None] * 14 + [place] for place in places]
+    return PAYLOAD_PREFIX + "\n" + json.dumps([[query, entries]],
+                                               ensure_ascii=False)
+
+
+class FakeElement:
+    """A WebElement backed by a parsed HTML tag."""
+
+    def __init__(self, driver, tag=None, on_click=None):
+        self.driver = driver
+        self.tag = tag
+        self.on_click = on_click
+
+    @property
+    def text(self):
+        self.driver._tick()
+        return " ".join(self.tag.stripped_strings) if self.tag else ""
+
+    def get_attribute(self, name):
+        self.driver._tick()
+        return self.tag.get(name) if self.tag else None
+
+    def is_displayed(self):
+        self.driver._tick()
+        return True
+
+    def is_enabled(self):
+        self.driver._tick()
+        return True
+
+    def click(self):
+        self.driver._tick()
+        if self.on_click:
+            self.on_click()
+
+    def clear(self):
+        self.driver._tick()
+
+    def send_keys(self, *keys):
+        self.driver._tick()
+
+    def submit(self):
+        self.driver._tick()
+        self.driver._search()
+
+
+class MapsFakeDriver(FakeDriver):
+    """
+    Replays the recorded Google Maps pages for scrape_google_maps.
+
+    The search box is ready at once, the results feed reveals `page_size`
+    of its `cards` per scroll, and clicking a card opens the recorded
+    detail panel under that card's name. Once response capture has been
+    installed, each page of results is also delivered as a recorded
+    search response. Every driver call sleeps `latency` seconds to stand
+    in for the WebDriver round trip.
+    """
+
+    def __init__(self, cards=20, page_size=7, latency=0.0):
+        super().__init__()
+        _, self.cards, _ = recorded_feed_cards(cards)
+        self.names = [
+            re.search(r'aria-label="([^"]+)"', card).group(1)
+            for card in self.cards
+        ]
+        self.page_size = page_size
+        self.latency = latency
+        self.detail = BeautifulSoup(read_fixture("maps_detail.html"),
+                                    "html.parser")
+        self.places = recorded_places(cards)
+        self.capturing = False
+        self.loaded = 0
+        self.drained = 0
+        self.open_card = None
+
+    def _tick(self):
+        super()._tick()
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _search(self):
+        self.loaded = min(len(self.cards), self.page_size)
+        self.open_card = None
+
+    def _open(self, index):
+        self.open_card = index
+
+    def _close(self):
+        self.open_card = None
+
+    def get(self, url):
+        super().get(url)
+        self.loaded = 0
+        self.drained = 0
+        self.open_card = None
+        if "/maps/search/" in url:
+            # Search URLs open straight on their results
+            self._search()
+
+    def find_elements(self, by, value):
+        self._tick()
+        if by == By.ID and value == "searchboxinput":
+            return [FakeElement(self)]
+        if by != By.CSS_SELECTOR:
+            return []
+        if value == "div[role='article']":
+            return [
+                FakeElement(self, on_click=lambda i=i: self._open(i))
+                for i in range(self.loaded)
+            ]
+        if self.open_card is None:
+            return []
+        on_click = self._close if value == "button[aria-label='Back']" else None
+        return [
+            FakeElement(self, tag, on_click)
+            for tag in self.detail.select(value)
+        ]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self._tick()
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            self.capturing = True
+        return {}
+
+    def _drain(self):
+        if not self.capturing or self.drained >= self.loaded:
+            return []
+        payload = search_payload("Mobile phone shop",
+                                 self.places[self.drained:self.loaded])
+        self.drained = self.loaded
+        return [payload]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element for {value}")
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        self._tick()
+        ended = self.loaded >= len(self.cards)
+        if script == SEARCH_STATE_SCRIPT:
+            return "feed" if self.loaded else False
+        if script == FEED_HTML_SCRIPT:
+            start = args[0] if args else 0
+            return "\n".join(self.cards[start:self.loaded])
+        if script == FEED_STATE_SCRIPT:
+            return [self.loaded, ended]
+        if script == DETAIL_NAME_SCRIPT:
+            return ("" if self.open_card is None else
+                    self.names[self.open_card])
+        if script == DRAIN_PAYLOADS_SCRIPT:
+            return self._drain()
+        if script == FEED_VISIBLE_SCRIPT:
+            return self.loaded > 0 and self.open_card is None
+        if "scrollTo" in script:
+            self.loaded = min(len(self.cards), self.loaded + self.page_size)
+            return None
+        return 1
+
+
+class _ShopSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # Requests arrive proxy-style ("GET http://host/path"), so one
+        # server can stand in for any number of shop domains
+        url = urlparse(self.path)
+        host = (url.hostname
+                or self.headers.get("Host", "shop")).removeprefix("www.")
+        shop = host.split(".")[0]
+        time.sleep(self.server.latency)
+
+        if url.path in ("", "/"):
+            body = (f"<html><body><h1>{shop}</h1>"
+                    f"<a href='mailto:ventas@{host}'>Escríbenos</a>"
+                    f"<a href='https://www.instagram.com/{shop}/'>IG</a>"
+                    f"<a href='/contacto'>Contacto</a></body></html>")
+        elif url.path == "/contacto":
+            body = (f"<html><body><p>Correo: info@{host}</p>"
+                    f"<a href='https://wa.me/573001234567'>WhatsApp</a>"
+                    f"<a href='https://facebook.com/{shop}'>FB</a>"
+                    f"</body></html>")
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.server.lock:
+            self.server.requests += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebsiteServer:
+    """
+    Local stand-in for lead websites, used as an HTTP proxy.
+
+    Every host gets a small home page with an email and an Instagram link
+    plus a contact page with another email, a WhatsApp link and a Facebook
+    page. `latency` seconds are added to each response.
+    """
+
+    def __init__(self, latency=0.0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ShopSiteHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        daemon=True)
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
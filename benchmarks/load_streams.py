@@ -0,0 +1,215 @@
+"""
+Load test: how many clients can wait on running jobs at once.
+
+Serves the app on a local port, queues one long job that publishes a lead
+every --interval seconds, and connects --clients clients to it at once:
+lead streams (/jobs/<id>/stream) or long-polls (/jobs/<id>?wait=). Then
+reports how many got every lead and the final event, how long their
+responses took to start, and the peak number of threads in the process.
+
+--server asgi serves asgi.application on uvicorn, where waiting clients
+are coroutines. --server wsgi serves the Flask app on Werkzeug's threaded
+server, one thread per open connection, for comparison. Exits 1 if any
+client did not get the whole job.
+
+Run from the project root:
+    python -m benchmarks.load_streams --server asgi --clients 500
+    python -m benchmarks.load_streams --server wsgi --clients 500
+    python -m benchmarks.load_streams --mode poll --clients 1000
+"""
+import argparse
+import asyncio
+import logging
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.suite import percentile
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_asgi(port, backlog):
+    import uvicorn
+
+    import asgi
+
+    server = uvicorn.Server(
+        uvicorn.Config(asgi.application,
+                       host="127.0.0.1",
+                       port=port,
+                       backlog=backlog,
+                       log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+        thread.join()
+
+    return stop
+
+
+def serve_wsgi(port, backlog):
+    from werkzeug.serving import make_server
+
+    import app
+
+    server = make_server("127.0.0.1", port, app.app, threaded=True)
+    server.socket.listen(backlog)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+SERVERS = {"asgi": serve_asgi, "wsgi": serve_wsgi}
+
+
+def drip_job(leads, interval, go):
+    """A job that publishes `leads` leads, one every `interval` seconds."""
+
+    def run(job):
+        go.wait()
+        for index in range(leads):
+            time.sleep(interval)
+            job.add_lead({"name": f"Shop {index}", "phone": "", "rating": ""})
+        return {"count": leads}
+
+    return run
+
+
+async def client(port, path, marker, timeout):
+    """(seconds until the response started, response bytes) for one GET."""
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 "Connection: close\r\n\r\n".encode())
+    await writer.drain()
+
+    body = bytearray()
+    started = None
+    try:
+        async with asyncio.timeout(timeout):
+            while marker not in body[-256:]:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                if started is None:
+                    started = time.perf_counter() - start
+                body += chunk
+    finally:
+        writer.close()
+    return started, bytes(body)
+
+
+async def run_clients(port, paths, marker, timeout, connected):
+    tasks = [
+        asyncio.ensure_future(client(port, path, marker, timeout))
+        for path in paths
+    ]
+    await connected(tasks)
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def sample_threads(peak, stop):
+    while not stop.wait(0.02):
+        peak[0] = max(peak[0], threading.active_count())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--server", choices=sorted(SERVERS), default="asgi")
+    parser.add_argument("--mode", choices=["stream", "poll"], default="stream")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--leads", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    # Every client holds two sockets in this process: its own and the
+    # server's end
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if 2 * args.clients + 100 > hard:
+        parser.error(f"--clients needs about {2 * args.clients + 100} open "
+                     f"files; the limit here is {hard}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from benchmarks.suite import configure
+        configure(tmp, 0)
+        logging.disable(logging.WARNING)
+        import app
+
+        port = free_port()
+        stop_server = SERVERS[args.server](port, args.clients)
+        idle_threads = threading.active_count()
+
+        go = threading.Event()
+        job = app.job_queue.submit(drip_job(args.leads, args.interval, go),
+                                   {"load_test": True},
+                                   total=args.leads)
+        if args.mode == "stream":
+            path, marker = f"/jobs/{job.id}/stream", b"event: completed"
+        else:
+            path, marker = f"/jobs/{job.id}?wait={args.timeout}", b"}"
+
+        peak = [idle_threads]
+        stop_sampling = threading.Event()
+        threading.Thread(target=sample_threads,
+                         args=(peak, stop_sampling),
+                         daemon=True).start()
+
+        async def connected(tasks):
+            # Hold the job back until every client is connected and waiting
+            await asyncio.sleep(min(5.0, 0.5 + args.clients / 500))
+            go.set()
+
+        start = time.perf_counter()
+        results = asyncio.run(
+            run_clients(port, [path] * args.clients, marker, args.timeout,
+                        connected))
+        elapsed = time.perf_counter() - start
+        stop_sampling.set()
+        stop_server()
+        app.job_queue.shutdown()
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    responses = [r for r in results if not isinstance(r, BaseException)]
+    if args.mode == "stream":
+        complete = [
+            body for _, body in responses
+            if body.count(b"event: lead\n") == args.leads and marker in body
+        ]
+    else:
+        complete = [
+            body for _, body in responses if b'"status":"completed"' in body
+        ]
+    started = [s for s, _ in responses if s is not None]
+
+    print(f"{args.server} server, {args.clients} {args.mode} clients, "
+          f"{args.leads} leads over {args.leads * args.interval:.1f}s")
+    print(f"complete   {len(complete):>6}/{args.clients}  "
+          f"({len(errors)} errors)")
+    if started:
+        print(f"response   p50 {percentile(started, 50) * 1000:8.1f} ms  "
+              f"p95 {percentile(started, 95) * 1000:8.1f} ms  "
+              f"max {max(started) * 1000:8.1f} ms")
+    print(f"threads    {idle_threads} before clients, {peak[0]} peak")
+    print(f"elapsed    {elapsed:.2f}s")
+    for error in errors[:5]:
+        print(f"error      {type(error).__name__}: {error}")
+    if len(complete) < args.clients:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
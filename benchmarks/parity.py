@@ -0,0 +1,121 @@
+"""
+Check that the network engine reads the same leads as the DOM engine.
+
+First the parsers: every business in the recorded results feed must come
+out of the recorded search response with the same name, phone, website,
+rating and lead_identity, and the card's short address must begin the
+response's full one. Then the engines: scrape_google_maps on
+MapsFakeDriver must return the same businesses, and mark the same
+identities seen on the resume cursor, with SCRAPE_ENGINE "dom" and
+"network"; the time each took is printed. Exits 1 on any mismatch.
+
+Run from the project root:
+    python -m benchmarks.parity --cards 60 --latency 0.002
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_feed_parser import load_feed
+from benchmarks.fakes import read_fixture
+from feed_parser import parse_feed_html
+from payloads import parse_search_payload
+from resume import ScrapeCursor, lead_identity
+
+FIELDS = ["name", "address", "phone", "website", "rating"]
+
+
+def compare(dom_leads, network_leads):
+    """Mismatches between two lead lists, matched up by name."""
+    problems = []
+    network = {lead["name"]: lead for lead in network_leads}
+    for lead in dom_leads:
+        other = network.pop(lead["name"], None)
+        if other is None:
+            problems.append(f"{lead['name']}: missing from network leads")
+            continue
+        for field in FIELDS[1:]:
+            expected, found = lead[field], other[field]
+            if not expected:
+                continue
+            if field == "address":
+                matches = found.startswith(expected)
+            else:
+                matches = found == expected
+            if not matches:
+                problems.append(f"{lead['name']}: {field} {found!r} "
+                                f"!= {expected!r}")
+        if "place_url" in lead and lead_identity(lead) != lead_identity(
+                other):
+            problems.append(f"{lead['name']}: identity "
+                            f"{lead_identity(other)!r} != "
+                            f"{lead_identity(lead)!r}")
+    problems.extend(f"{name}: missing from DOM leads" for name in network)
+    return problems
+
+
+def check_parsers():
+    dom = parse_feed_html(load_feed(6))
+    network = parse_search_payload(read_fixture("maps_search_payload.txt"))
+    filled = sum(1 for a in dom for b in network if a["name"] == b["name"]
+                 for field in FIELDS if not a[field] and b[field])
+    print(f"parsers: {len(dom)} feed cards, {len(network)} response "
+          f"listings, {filled} fields only the response has")
+    return compare(dom, network)
+
+
+def check_engines(app, cards, latency):
+    from benchmarks.fakes import MapsFakeDriver
+    from driver_pool import DriverPool
+
+    app.driver_pool = DriverPool(
+        lambda: MapsFakeDriver(cards=cards, latency=latency), size=1)
+    leads = {}
+    seen = {}
+    for engine in ("dom", "network"):
+        app.SCRAPE_ENGINE = engine
+        cursor = ScrapeCursor()
+        start = time.perf_counter()
+        leads[engine] = app.scrape_google_maps("Mobile phone shop in Lima, "
+                                               "Peru",
+                                               limit=cards,
+                                               cursor=cursor)
+        elapsed = time.perf_counter() - start
+        seen[engine] = cursor.seen
+        print(f"{engine:<8} {len(leads[engine]):>4} leads in "
+              f"{elapsed * 1000:8.1f} ms")
+    problems = compare(leads["dom"], leads["network"])
+    problems.extend(f"{identity}: only the DOM engine saw it"
+                    for identity in sorted(seen["dom"] - seen["network"]))
+    problems.extend(f"{identity}: only the network engine saw it"
+                    for identity in sorted(seen["network"] - seen["dom"]))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--cards", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    problems = check_parsers()
+    with tempfile.TemporaryDirectory() as tmp:
+        from benchmarks.suite import configure
+        configure(tmp, args.latency)
+        logging.disable(logging.WARNING)
+        import app
+        problems += check_engines(app, args.cards, args.latency)
+        app.job_queue.shutdown()
+
+    for problem in problems:
+        print(f"MISMATCH {problem}")
+    if problems:
+        sys.exit(1)
+    print("Engines agree")
+
+
+if __name__ == "__main__":
+    main()
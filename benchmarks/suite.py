@@ -0,0 +1,325 @@
+"""
+Offline benchmark suite for the scrape, mock data, listing and export paths.
+
+Every case runs at several sizes and reports p50/p95/p99 latency and
+throughput. Nothing touches the network or launches Chrome: scrapes run
+scrape_google_maps on benchmarks.fakes.MapsFakeDriver, which replays the
+recorded Maps pages in benchmarks/fixtures, and all databases and exports
+live in a temporary directory.
+
+With --check, a case whose p50 is more than --tolerance times its p50 in
+the baseline file fails the run (exit status 1). Baselines are machine
+specific; refresh them with --update-baseline after an intended change or
+on new hardware.
+
+Run from the project root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --check
+    python -m benchmarks.suite --update-baseline
+    python -m benchmarks.suite --only scrape export --latency 0.002
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Sizes per case: leads scraped or generated, runs listed, rows exported
+SIZES = {
+    "scrape": [20, 100],
+    "scrape_network": [20, 100],
+    "mock_data": [100, 10_000],
+    "mock_batches": [100_000, 1_000_000],
+    "leads": [100, 10_000],
+    "store": [100, 1_000],
+    "export": [1_000, 50_000],
+    "merge": [1_000, 50_000],
+    "download": [1_000, 50_000]
+}
+
+# Regressions smaller than this are timer noise whatever the ratio
+MIN_DELTA_MS = 1.0
+
+
+def configure(tmp, latency):
+    """Point all app state at `tmp` before app is imported."""
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'leads.db')}",
+        "EXPORT_DIR": os.path.join(tmp, "exports"),
+        "LEADS_MANIFEST": os.path.join(tmp, "leads_manifest.jsonl"),
+        "RESULT_CACHE_PATH": os.path.join(tmp, "result_cache.db"),
+        "DEDUP_INDEX_PATH": os.path.join(tmp, "dedup_index.db"),
+        "CHROME_BINARY_CACHE_FILE": os.path.join(tmp, "chrome_binary.json"),
+        "CHROME_PROFILE_DIR": "",
+        "DRIVER_POOL_WARMUP": "0",
+        "MAPS_RATE_LIMIT": "1000000",
+        "MAPS_RATE_BURST": "1000000"
+    })
+    os.environ["BENCH_LATENCY"] = str(latency)
+
+
+def sample_leads(count):
+    from mock_data import generate_mock_data
+    leads = generate_mock_data("Peru", "Lima", "Mobile phone shop",
+                               min(count, 1000))
+    return [leads[i % len(leads)] for i in range(count)]
+
+
+def case_scrape(app, size, engine="dom"):
+    from benchmarks.fakes import MapsFakeDriver
+    from driver_pool import DriverPool
+
+    app.SCRAPE_ENGINE = engine
+    latency = float(os.environ["BENCH_LATENCY"])
+    app.driver_pool = DriverPool(
+        lambda: MapsFakeDriver(cards=size, latency=latency),
+        size=1,
+        max_uses=1_000_000)
+
+    def run():
+        leads = app.scrape_google_maps("Mobile phone shop in Lima, Peru",
+                                       limit=size)
+        assert len(leads) == size, len(leads)
+
+    return run
+
+
+def case_scrape_network(app, size):
+    return case_scrape(app, size, engine="network")
+
+
+def case_mock_data(app, size):
+    return lambda: app.generate_mock_data("Peru", "Lima", "Mobile phone shop",
+                                          size)
+
+
+def case_mock_batches(app, size):
+    from mock_data import mock_lead_batches
+
+    def run():
+        for _ in mock_lead_batches("Peru", "Lima", "Mobile phone shop", size,
+                                   seed=1):
+            pass
+
+    return run
+
+
+def case_leads(app, size):
+    from sqlalchemy import delete, insert
+
+    from benchmarks.bench_leads_index import fill
+    from manifest import RunManifest
+    from models import Run
+
+    path = os.path.join(os.path.dirname(app.run_manifest.path),
+                        f"leads_manifest_{size}.jsonl")
+    fill(RunManifest(path), size)
+    app.run_manifest = RunManifest(path)
+    # /leads lists runs from the lead store, with the same filenames
+    with app.app.app_context():
+        app.db.session.execute(delete(Run))
+        app.db.session.execute(insert(Run), [{
+            "query": "Mobile phone shop in Lima, Peru",
+            "country": "Peru",
+            "city": "Lima",
+            "business_type": "Mobile phone shop",
+            "lead_count": 20,
+            "source": "mock",
+            "filename": f"leads_Peru_Lima_{i:08d}.csv"
+        } for i in range(size)])
+        app.db.session.commit()
+    client = app.app.test_client()
+    page = 2 if size > app.LEADS_PAGE_SIZE else 1
+
+    def run():
+        response = client.get(f"/leads?page={page}")
+        assert response.status_code == 200, response.status_code
+        assert b"leads_Peru_Lima_" in response.data
+
+    return run
+
+
+def case_store(app, size):
+    leads = sample_leads(size)
+    params = {"country": "Peru", "city": "Lima", "limit": size,
+              "business_type": "Mobile phone shop"}
+    filename = f"leads_store_{size}.csv"
+    write_export(app, app.export_path(filename), "csv", leads)
+    runs = itertools.count()
+
+    def run():
+        # Run filenames are unique in the lead store
+        app.save_run("bench", params, leads, f"{next(runs)}_{filename}",
+                     "scraped", 1.0)
+        app.record_export(filename, "bench", params, size, "scraped", 1.0)
+
+    return run
+
+
+def write_export(app, path, fmt, leads):
+    writer = app.open_export(path, fmt, app.LEAD_FIELDS)
+    try:
+        writer.write_many(leads)
+    finally:
+        writer.close()
+
+
+def _export_cases(app, size):
+    return [(fmt, app.export_path(f"leads_bench_{size}{ext}"))
+            for fmt, ext in app.EXPORT_FORMATS.items()
+            if app.format_available(fmt)]
+
+
+def case_export(app, size):
+    leads = sample_leads(size)
+    targets = _export_cases(app, size)
+
+    def run():
+        for fmt, path in targets:
+            write_export(app, path, fmt, leads)
+
+    return run
+
+
+def case_merge(app, size):
+    # One source per export format, `size` rows between them
+    per_source = size // len(_export_cases(app, 0))
+    case_export(app, per_source)()
+    sources = [(path, {}) for _, path in _export_cases(app, per_source)]
+    target = app.export_path(f"leads_merged_bench_{size}.csv")
+
+    def run():
+        count = app.merge_exports(sources, target, "csv", app.LEAD_FIELDS)
+        assert count == per_source * len(sources), count
+
+    return run
+
+
+def case_download(app, size):
+    case_export(app, size)()
+    filename = f"leads_bench_{size}.csv"
+    app.precompress(app.export_path(filename))
+    client = app.app.test_client()
+
+    def run():
+        for encoding in ("identity", "gzip"):
+            response = client.get(f"/download/{filename}",
+                                  headers={"Accept-Encoding": encoding})
+            assert response.status_code == 200, response.status_code
+            response.get_data()
+
+    return run
+
+
+CASES = {
+    "scrape": case_scrape,
+    "scrape_network": case_scrape_network,
+    "mock_data": case_mock_data,
+    "mock_batches": case_mock_batches,
+    "leads": case_leads,
+    "store": case_store,
+    "export": case_export,
+    "merge": case_merge,
+    "download": case_download
+}
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of `samples`, q in [0, 100]."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(run, size, repeat):
+    run()  # warm up caches, imports and connection pools
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    p50 = percentile(samples, 50)
+    return {
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "per_second": round(size / (p50 / 1000), 1) if p50 else 0.0
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return (case, current p50, baseline p50) for every regression."""
+    regressions = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        current, before = result["p50_ms"], previous["p50_ms"]
+        if current > before * tolerance and current - before > MIN_DELTA_MS:
+            regressions.append((case, current, before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--latency",
+                        type=float,
+                        default=0.0,
+                        help="seconds added to every fake WebDriver call")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(tmp, args.latency)
+        logging.disable(logging.WARNING)
+        import app
+
+        results = {}
+        for name in args.only or CASES:
+            for size in SIZES[name]:
+                run = CASES[name](app, size)
+                result = measure(run, size, args.repeat)
+                results[f"{name}/{size}"] = result
+                print(f"{name + '/' + str(size):<22} "
+                      f"p50 {result['p50_ms']:9.2f} ms  "
+                      f"p95 {result['p95_ms']:9.2f} ms  "
+                      f"p99 {result['p99_ms']:9.2f} ms  "
+                      f"{result['per_second']:12.1f}/s")
+        app.job_queue.shutdown()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(dict(sorted(baseline.items())), file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for case, current, before in regressions:
+            print(f"REGRESSION {case}: p50 {current:.2f} ms vs "
+                  f"{before:.2f} ms baseline (x{current / before:.2f})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond x{args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
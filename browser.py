@@ -0,0 +1,152 @@
+import fcntl
+import logging
+import os
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# URL patterns for Network.setBlockedURLs, by kind of resource. Scraping
+# only reads the DOM, so none of these are ever needed.
+BLOCK_PATTERNS = {
+    "images": [
+        "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*",
+        "*.ico*", "*.ggpht.com/*", "*googleusercontent.com/*"
+    ],
+    "tiles": [
+        "*/maps/vt*", "*/maps/vt/*", "*/kh/v=*", "*/maps/rpc/vt*",
+        "*streetviewpixels-pa.googleapis.com/*", "*/maps/preview/photo*"
+    ],
+    "fonts": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*fonts.gstatic.com/*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m3u8*"]
+}
+
+# Chrome prefs that refuse images, notifications and device access outright
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False
+}
+
+# Background services and features a scraping browser never uses
+LEAN_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,"
+    "AutofillServerCommunication,InterestFeedContentSuggestions",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--renderer-process-limit=2",
+]
+
+
+def blocked_patterns(categories):
+    patterns = []
+    for category in categories:
+        if category not in BLOCK_PATTERNS:
+            logger.warning(f"Unknown resource category to block: {category}")
+            continue
+        patterns.extend(BLOCK_PATTERNS[category])
+    return patterns
+
+
+def apply_lean_options(options, profile_dir=None, disk_cache_size=None):
+    """Add lean-mode arguments, prefs and an optional profile to Options."""
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", LEAN_PREFS)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument(
+            f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
+    if disk_cache_size:
+        options.add_argument(f"--disk-cache-size={disk_cache_size}")
+
+
+def block_requests(driver, patterns):
+    """Have Chrome fail requests for matching URLs before they are sent."""
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logger.error(f"Could not enable request blocking: {str(e)}")
+
+
+class ProfileSlots:
+    """
+    Persistent Chrome profiles, one per live browser.
+
+    Chrome locks its profile directory, so concurrent browsers each claim
+    their own numbered slot under `base_dir`. A claim holds an exclusive
+    lock on the slot's lock file, which keeps other processes on the node
+    (the app and worker.py) out of it too. A slot is released when its
+    driver quits, or failing that when it is garbage collected, and the
+    next browser reuses its warm profile and disk cache.
+    """
+
+    LOCK_FILE = ".slot.lock"
+
+    def __init__(self, base_dir):
+        self.base_dir = os.path.abspath(base_dir)
+        self._lock = threading.Lock()
+        self._claimed = {}
+
+    def _try_lock(self, path):
+        os.makedirs(path, exist_ok=True)
+        fd = os.open(os.path.join(path, self.LOCK_FILE),
+                     os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def claim(self):
+        with self._lock:
+            slot = 0
+            while True:
+                path = os.path.join(self.base_dir, f"slot-{slot}")
+                if slot not in self._claimed:
+                    fd = self._try_lock(path)
+                    if fd is not None:
+                        self._claimed[slot] = fd
+                        return slot, path
+                slot += 1
+
+    def release(self, slot):
+        with self._lock:
+            fd = self._claimed.pop(slot, None)
+        if fd is not None:
+            # Closing the descriptor drops the lock
+            os.close(fd)
+
+    def bind(self, driver, slot):
+        """Release `slot` when `driver` quits or is gone."""
+        quit = driver.quit
+
+        def quit_and_release():
+            try:
+                quit()
+            finally:
+                self.release(slot)
+
+        driver.quit = quit_and_release
+        weakref.finalize(driver, self.release, slot)
+
+    def snapshot(self):
+        with self._lock:
+            return {"claimed": sorted(self._claimed)}
@@ -0,0 +1,248 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import closing
+from urllib.parse import urlparse
+
+from mock_data import COUNTRY_CODES
+
+logger = logging.getLogger(__name__)
+
+# Hosts that many unrelated businesses share, so they say nothing about
+# which business a lead is
+SHARED_HOSTS = {
+    "facebook.com", "m.facebook.com", "instagram.com", "wa.me",
+    "api.whatsapp.com", "linktr.ee", "sites.google.com", "business.site",
+    "g.page", "maps.google.com", "goo.gl", "bit.ly", "tiktok.com",
+    "twitter.com", "x.com", "youtube.com", "mercadolibre.com",
+    "mercadolivre.com.br", "wixsite.com", "blogspot.com"
+}
+
+# Words that differ between listings of the same business without
+# identifying it: articles, connectors and company-type suffixes
+NAME_STOPWORDS = {
+    "de", "del", "la", "el", "los", "las", "y", "e", "the", "and", "s", "sa",
+    "sas", "sac", "srl", "ltda", "eirl", "spa", "cv", "inc", "llc", "cia",
+    "co"
+}
+
+KEY_KINDS = ["phone", "domain", "name"]
+
+
+def _fold(text):
+    """Strip accents and case so "Electrónica" and "ELECTRONICA" compare equal."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def normalize_phone(phone, country=None):
+    """
+    E.164-style digits for a phone number, e.g. "+573001234567".
+
+    Numbers written without an international prefix get the country's
+    calling code; returns "" when there are too few digits to be a number.
+    """
+    phone = (phone or "").strip()
+    digits = re.sub(r"\D", "", phone)
+    if phone.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        code = COUNTRY_CODES.get(country, "").lstrip("+")
+        digits = digits.lstrip("0")
+        if code and not (digits.startswith(code) and len(digits) > 10):
+            digits = code + digits
+    if len(digits) < 8:
+        return ""
+    return f"+{digits}"
+
+
+def normalize_domain(website):
+    """Registered host of a website without "www." or port; "" if shared."""
+    website = (website or "").strip()
+    if not website:
+        return ""
+    if "://" not in website:
+        website = f"http://{website}"
+    try:
+        host = (urlparse(website).hostname or "").lower()
+    except ValueError:
+        return ""
+    host = host.removeprefix("www.").rstrip(".")
+    if not host or host in SHARED_HOSTS or any(
+            host.endswith(f".{shared}") for shared in SHARED_HOSTS):
+        return ""
+    return host
+
+
+def normalize_name(name):
+    """
+    Fuzzy key for a business name: accent- and case-folded, punctuation and
+    filler words dropped, remaining words sorted, so "Celulares García
+    S.A.S." and "garcia celulares" share a key.
+    """
+    name = _fold(name).replace("'s", "")
+    name = re.sub(r"(?<=\b\w)\.(?=\w\b)", "", name)
+    words = [w for w in re.split(r"[\W_]+", name) if w]
+    return " ".join(sorted(w for w in words if w not in NAME_STOPWORDS))
+
+
+def dedup_keys(lead, country=None, city=None):
+    """
+    The (kind, key) pairs that identify a lead's business.
+
+    A lead is a duplicate when any of its keys was seen before: the same
+    phone, the same website in the same city, or the same fuzzy name at
+    the same street number in the same city.
+    """
+    country = lead.get("country") or country
+    city = _fold(lead.get("city") or city)
+    keys = []
+
+    phone = normalize_phone(lead.get("phone"), country)
+    if phone:
+        keys.append(("phone", phone))
+
+    domain = normalize_domain(lead.get("website"))
+    if domain:
+        keys.append(("domain", f"{domain}|{city}"))
+
+    name = normalize_name(lead.get("name"))
+    if name:
+        numbers = " ".join(re.findall(r"\d+", lead.get("address") or ""))
+        keys.append(("name", f"{name}|{city}|{numbers}"))
+
+    return keys
+
+
+def key_hash(kind, key):
+    """Signed 64-bit hash of a key, so it fits an SQLite INTEGER column."""
+    digest = hashlib.blake2b(f"{kind}:{key}".encode("utf-8"),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class DedupIndex:
+    """
+    Hashed index of every business already exported, across all runs.
+
+    Each key is stored as a 64-bit hash mapped to the run that first saw
+    it. The hashes are kept in memory, so checking a lead is a few dict
+    lookups however many runs came before, and persisted in SQLite so the
+    index survives restarts.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._keys = None
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_keys (
+                    key_hash INTEGER PRIMARY KEY,
+                    run TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _load(self):
+        if self._keys is None:
+            with closing(self._connect()) as conn:
+                self._keys = dict(
+                    conn.execute("SELECT key_hash, run FROM dedup_keys"))
+            logger.info(f"Loaded {len(self._keys)} dedup keys")
+        return self._keys
+
+    def claim(self, hashes, run):
+        """
+        Register a lead's key hashes for `run` unless one is already taken.
+
+        Returns (None, None) when the lead is new, else the index of the
+        first matching hash and the run that owns it.
+        """
+        with self._lock:
+            keys = self._load()
+            for i, h in enumerate(hashes):
+                owner = keys.get(h)
+                if owner is not None:
+                    return i, owner
+            for h in hashes:
+                keys[h] = run
+        return None, None
+
+    def persist(self, hashes, run):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO dedup_keys (key_hash, run, created_at) "
+                "VALUES (?, ?, ?)", ((h, run, now) for h in hashes))
+
+    def start(self, run, country=None, city=None):
+        return DedupRun(self, run, country, city)
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM dedup_keys")
+
+    def snapshot(self):
+        with self._lock:
+            return {"keys": len(self._load())}
+
+
+class DedupRun:
+    """Checks one run's leads against the index and counts what it drops."""
+
+    def __init__(self, index, run, country=None, city=None):
+        self.index = index
+        self.run = run
+        self.country = country
+        self.city = city
+        self._new = []
+        self.stats = {
+            "checked": 0,
+            "unique": 0,
+            "duplicates": 0,
+            "within_run": 0,
+            "by_key": {kind: 0
+                       for kind in KEY_KINDS},
+            "previous_runs": {}
+        }
+
+    def check(self, lead):
+        """Return True if the lead is new; new leads' keys are claimed."""
+        keys = dedup_keys(lead, self.country, self.city)
+        hashes = [key_hash(kind, key) for kind, key in keys]
+        matched, owner = self.index.claim(hashes, self.run)
+
+        self.stats["checked"] += 1
+        if matched is None:
+            self.stats["unique"] += 1
+            self._new.extend(hashes)
+            return True
+
+        self.stats["duplicates"] += 1
+        self.stats["by_key"][keys[matched][0]] += 1
+        if owner == self.run:
+            self.stats["within_run"] += 1
+        else:
+            previous = self.stats["previous_runs"]
+            previous[owner] = previous.get(owner, 0) + 1
+        return False
+
+    def commit(self):
+        """Persist the keys of this run's new leads."""
+        if self._new:
+            self.index.persist(self._new, self.run)
+            self._new = []
+        return self.stats
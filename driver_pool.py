@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PooledDriver:
+    """A browser held by the pool plus the bookkeeping used for recycling."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class DriverPool:
+    """
+    Keep a fixed number of warm WebDriver instances that /scrape calls
+    borrow instead of launching a fresh browser every time.
+
+    `factory` is any zero-argument callable returning a driver (or None when
+    the browser cannot be started), so the pool can be exercised with a fake
+    driver and no real Chrome.
+    """
+
+    def __init__(self,
+                 factory,
+                 size=2,
+                 max_uses=25,
+                 max_age=1800,
+                 acquire_timeout=60):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {
+            "created": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "acquired": 0,
+            "timeouts": 0
+        }
+
+    def _create(self):
+        driver = self.factory()
+        if driver is None:
+            return None
+        with self._cond:
+            self.stats["created"] += 1
+        return PooledDriver(driver)
+
+    def _destroy(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing pooled driver: {str(e)}")
+
+    def _is_healthy(self, pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled driver failed health check: {str(e)}")
+            return False
+
+    def _is_expired(self, pooled):
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return True
+        if self.max_age and time.monotonic() - pooled.created_at > self.max_age:
+            return True
+        return False
+
+    def warm_up(self, count=None):
+        """Start browsers up front so the first scrape does not pay for it."""
+        target = self.size if count is None else min(count, self.size)
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._total >= target:
+                    break
+                self._total += 1
+            pooled = self._create()
+            with self._cond:
+                if pooled is None:
+                    self._total -= 1
+                    self._cond.notify()
+                    break
+                self._idle.append(pooled)
+                self._cond.notify()
+            started += 1
+        logger.info(f"Driver pool warmed up with {started} new browsers")
+        return started
+
+    def warm_up_async(self, count=None):
+        thread = threading.Thread(target=self.warm_up,
+                                  args=(count, ),
+                                  name="driver-pool-warmup",
+                                  daemon=True)
+        thread.start()
+        return thread
+
+    def acquire(self, timeout=None):
+        """Borrow a driver, starting one if the pool has spare capacity."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._cond:
+                pooled = None
+                while not self._closed:
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        logger.warning("Timed out waiting for a pooled driver")
+                        return None
+                    self._cond.wait(remaining)
+                else:
+                    return None
+
+            if pooled is None:
+                # We reserved a slot above; start the browser outside the lock
+                pooled = self._create()
+                if pooled is None:
+                    self._discard_slot()
+                    return None
+            elif self._is_expired(pooled):
+                self._retire(pooled)
+                continue
+            elif not self._is_healthy(pooled):
+                with self._cond:
+                    self.stats["crashed"] += 1
+                self._retire(pooled)
+                continue
+
+            pooled.uses += 1
+            pooled.last_used = time.monotonic()
+            with self._cond:
+                self.stats["acquired"] += 1
+            return pooled
+
+    def release(self, pooled, broken=False):
+        """Return a borrowed driver, replacing it if it crashed or is worn out."""
+        if pooled is None:
+            return
+        if broken:
+            with self._cond:
+                self.stats["crashed"] += 1
+        if broken or self._is_expired(pooled):
+            self._retire(pooled)
+            return
+        with self._cond:
+            if self._closed:
+                self._total -= 1
+                close_now = True
+            else:
+                self._idle.append(pooled)
+                close_now = False
+            self._cond.notify()
+        if close_now:
+            self._destroy(pooled)
+
+    def _retire(self, pooled):
+        with self._cond:
+            self.stats["recycled"] += 1
+        self._destroy(pooled)
+        self._discard_slot()
+
+    def _discard_slot(self):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Context manager yielding a WebDriver (or None if none is available).
+
+        If the body raises, the driver is health-checked before it goes back
+        to the pool so a crashed browser is never handed out again.
+        """
+        pooled = self.acquire(timeout)
+        broken = False
+        try:
+            yield pooled.driver if pooled else None
+        except Exception:
+            broken = pooled is not None and not self._is_healthy(pooled)
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+
+    def snapshot(self):
+        with self._cond:
+            return dict(self.stats,
+                        size=self.size,
+                        total=self._total,
+                        idle=len(self._idle),
+                        busy=self._total - len(self._idle))
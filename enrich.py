@@ -0,0 +1,371 @@
+import ipaddress
+import json
+import logging
+import re
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import urllib3
+from bs4 import BeautifulSoup
+from email_validator import EmailNotValidError, validate_email
+
+from dedup import normalize_domain, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+ENRICH_FIELDS = ["emails", "socials", "whatsapp"]
+
+# Profile hosts worth keeping, mapped to the network they belong to
+SOCIAL_HOSTS = {
+    "facebook.com": "facebook",
+    "instagram.com": "instagram",
+    "tiktok.com": "tiktok",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "linkedin.com": "linkedin",
+    "youtube.com": "youtube"
+}
+
+# Links to a contact page, in the languages the leads are in
+CONTACT_WORDS = ("contact", "contacto", "contato", "contactenos",
+                 "contactanos", "fale-conosco", "fale conosco")
+
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_ASSET_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg")
+
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, "
+              "like Gecko) Chrome/112.0.5615.165 Safari/537.36")
+
+# Redirects followed per page; every hop is checked like the first URL
+MAX_REDIRECTS = 5
+
+
+def _public_address(address):
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_url(url):
+    """
+    Raise ValueError unless `url` is http(s) on a host that resolves only
+    to public addresses.
+
+    Lead websites come from scraped listings, so a fetch must never reach
+    loopback, link-local (cloud metadata) or private networks.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"not a web URL: {url}")
+    try:
+        addresses = socket.getaddrinfo(parsed.hostname,
+                                       parsed.port,
+                                       type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"cannot resolve {parsed.hostname}: {e}")
+    for *_, sockaddr in addresses:
+        if not _public_address(sockaddr[0]):
+            raise ValueError(f"{parsed.hostname} resolves to a non-public "
+                             f"address ({sockaddr[0]})")
+
+
+def _valid_email(candidate):
+    candidate = candidate.strip().strip(".").lower()
+    if candidate.endswith(_ASSET_SUFFIXES):
+        return None
+    try:
+        return validate_email(candidate,
+                              check_deliverability=False).normalized
+    except EmailNotValidError:
+        return None
+
+
+def _social_link(href):
+    parsed = urlparse(href)
+    host = (parsed.hostname or "").lower().removeprefix("www.").removeprefix(
+        "m.")
+    network = SOCIAL_HOSTS.get(host)
+    path = parsed.path.rstrip("/")
+    # A bare network home page or a share button is not a profile
+    if not network or not path or path.startswith(("/sharer", "/share",
+                                                   "/intent")):
+        return None
+    return network, f"https://{host}{path}"
+
+
+def _whatsapp_number(href):
+    parsed = urlparse(href)
+    host = (parsed.hostname or "").lower()
+    if host == "wa.me":
+        digits = parsed.path.strip("/")
+    elif host.endswith("whatsapp.com") or parsed.scheme == "whatsapp":
+        digits = (parse_qs(parsed.query).get("phone") or [""])[0]
+    else:
+        return None
+    digits = re.sub(r"\D", "", digits)
+    # wa.me numbers are always international, without the "+"
+    return normalize_phone(f"+{digits}") if digits else None
+
+
+def extract_contacts(html, base_url):
+    """
+    Emails, social profiles and WhatsApp numbers found on one page, plus
+    the URL of its contact page if it links to one.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    emails, socials, whatsapp = [], {}, []
+    contact_url = None
+    base_host = urlparse(base_url).hostname
+
+    for link in soup.find_all("a", href=True):
+        href = link["href"].strip()
+        if href.lower().startswith("mailto:"):
+            email = _valid_email(href[7:].split("?")[0])
+            if email and email not in emails:
+                emails.append(email)
+            continue
+
+        number = _whatsapp_number(href)
+        if number:
+            if number not in whatsapp:
+                whatsapp.append(number)
+            continue
+
+        social = _social_link(href)
+        if social:
+            socials.setdefault(*social)
+            continue
+
+        if contact_url is None:
+            url = urljoin(base_url, href)
+            label = f"{href} {link.get_text(' ', strip=True)}".lower()
+            if (urlparse(url).hostname == base_host
+                    and any(word in label for word in CONTACT_WORDS)
+                    and url.rstrip("/") != base_url.rstrip("/")):
+                contact_url = url
+
+    for candidate in _EMAIL.findall(soup.get_text(" ")):
+        email = _valid_email(candidate)
+        if email and email not in emails:
+            emails.append(email)
+
+    return {
+        "emails": emails,
+        "socials": list(socials.values()),
+        "whatsapp": whatsapp,
+        "contact_url": contact_url
+    }
+
+
+class EnrichmentCache:
+    """SQLite-backed cache of enrichment results, one entry per domain."""
+
+    def __init__(self, path, ttl=604800, failure_ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS website_enrichment (
+                    domain TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    failed INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, domain):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT result FROM website_enrichment WHERE domain = ? AND "
+                "fetched_at >= CASE failed WHEN 1 THEN ? ELSE ? END",
+                (domain, now - self.failure_ttl, now - self.ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, domain, result):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO website_enrichment "
+                "(domain, result, failed, fetched_at) VALUES (?, ?, ?, ?)",
+                (domain, json.dumps(result, ensure_ascii=False),
+                 int(bool(result.get("error"))), time.time()))
+
+
+class WebsiteEnricher:
+    """
+    Fetch lead websites and add the emails, social profiles and WhatsApp
+    numbers they list.
+
+    Each domain is fetched once (its home page, then its contact page if
+    the home page links to one) on a bounded pool of workers sharing one
+    pooled HTTP client, and the result is cached per domain. URLs that
+    fail check_url are not fetched unless `allow_private` is set, for
+    tests and benchmarks against local stand-in servers.
+    """
+
+    def __init__(self,
+                 cache=None,
+                 workers=16,
+                 timeout=10,
+                 max_bytes=1_000_000,
+                 proxy_url=None,
+                 allow_private=False):
+        self.cache = cache
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private
+        self.stats = {
+            "domains": 0,
+            "fetched": 0,
+            "cached": 0,
+            "failed": 0,
+            "pages": 0
+        }
+        self._lock = threading.Lock()
+
+        options = dict(num_pools=max(workers * 2, 10),
+                       maxsize=workers,
+                       headers={"User-Agent": USER_AGENT},
+                       timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                       retries=urllib3.Retry(total=2,
+                                             backoff_factor=0.2,
+                                             status_forcelist=(502, 503,
+                                                               504)))
+        if proxy_url:
+            self.http = urllib3.ProxyManager(proxy_url, **options)
+        else:
+            self.http = urllib3.PoolManager(**options)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def fetch(self, url):
+        """
+        Return (final_url, body) for an HTML page; raises on failure.
+
+        Redirects are followed here rather than by urllib3, so that every
+        hop goes through check_url.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            if not self.allow_private:
+                check_url(url)
+            response = self.http.request("GET",
+                                         url,
+                                         preload_content=False,
+                                         redirect=False)
+            location = response.get_redirect_location()
+            if not location:
+                break
+            response.drain_conn()
+            response.release_conn()
+            url = urljoin(url, location)
+        else:
+            raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+        body = None
+        try:
+            if response.status >= 400:
+                raise ValueError(f"HTTP {response.status}")
+            content_type = response.headers.get("Content-Type", "")
+            if "html" not in content_type and content_type:
+                raise ValueError(f"not HTML: {content_type}")
+            body = response.read(self.max_bytes)
+        finally:
+            # A connection can only go back to the pool once its body has
+            # been read to the end; anything else is dropped
+            if body is not None and len(body) < self.max_bytes:
+                response.release_conn()
+            else:
+                response.close()
+        self._count("pages")
+        return url, body
+
+    def enrich_domain(self, website):
+        """Contacts for one website, from the cache or the site itself."""
+        domain = normalize_domain(website)
+        if self.cache:
+            cached = self.cache.get(domain)
+            if cached is not None:
+                self._count("cached")
+                return cached
+
+        url = website if "://" in website else f"http://{website}"
+        result = {"emails": [], "socials": [], "whatsapp": [], "error": None}
+        try:
+            final_url, body = self.fetch(url)
+            found = extract_contacts(body, final_url)
+            contact_url = found.pop("contact_url")
+            if contact_url:
+                try:
+                    contact = extract_contacts(
+                        self.fetch(contact_url)[1], contact_url)
+                    for field in ENRICH_FIELDS:
+                        found[field] += [
+                            v for v in contact[field] if v not in found[field]
+                        ]
+                except Exception as e:
+                    logger.debug(f"Contact page {contact_url} failed: {e}")
+            result.update(found)
+            self._count("fetched")
+        except Exception as e:
+            logger.warning(f"Could not enrich {website}: {str(e)}")
+            result["error"] = str(e)[:200]
+            self._count("failed")
+
+        if self.cache:
+            self.cache.set(domain, result)
+        return result
+
+    def enrich(self, leads):
+        """
+        Return copies of the leads with ENRICH_FIELDS filled in.
+
+        Leads that share a domain share one fetch; leads without a website,
+        or whose website is a shared host such as a Facebook page, are
+        returned with the fields empty.
+        """
+        websites = {}
+        for lead in leads:
+            website = (lead.get("website") or "").strip()
+            domain = normalize_domain(website)
+            if domain and domain not in websites:
+                websites[domain] = website
+        self._count("domains", len(websites))
+
+        results = {}
+        if websites:
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="enrich") as pool:
+                results = dict(
+                    zip(websites,
+                        pool.map(self.enrich_domain, websites.values())))
+
+        enriched = []
+        for lead in leads:
+            result = results.get(normalize_domain(lead.get("website")), {})
+            enriched.append(
+                dict(lead,
+                     **{
+                         field: "; ".join(result.get(field) or [])
+                         for field in ENRICH_FIELDS
+                     }))
+        return enriched
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        self.http.clear()
@@ -0,0 +1,220 @@
+import csv
+import gzip
+import importlib.util
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Export format name -> file extension
+EXPORT_FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet"
+}
+
+# Columns that are not stored as text in typed formats
+FLOAT_FIELDS = {"rating"}
+
+CHUNK_SIZE = 10_000
+
+
+def parse_rating(rating):
+    try:
+        return float(str(rating).replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+
+def export_format(filename):
+    """The export format of a file, judged by its extension, or None."""
+    for fmt, extension in sorted(EXPORT_FORMATS.items(),
+                                 key=lambda item: -len(item[1])):
+        if filename.endswith(extension):
+            return fmt
+    return None
+
+
+def format_available(fmt):
+    """Whether leads can be exported in `fmt` with the installed packages."""
+    if fmt == "parquet":
+        return importlib.util.find_spec("pyarrow") is not None
+    return fmt in EXPORT_FORMATS
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow to be installed")
+    return pa, pq
+
+
+class CsvExportWriter:
+
+    def __init__(self, path, fields, compress=False):
+        if compress:
+            self._file = gzip.open(path,
+                                   "wt",
+                                   newline="",
+                                   encoding="utf-8",
+                                   compresslevel=6)
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        self._compress = compress
+        self._writer = csv.DictWriter(self._file,
+                                      fieldnames=fields,
+                                      extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, lead):
+        self._writer.writerow(lead)
+
+    def write_many(self, leads):
+        self._writer.writerows(leads)
+
+    def flush(self):
+        # Flushing a gzip stream mid-file costs compression, so only plain
+        # files are made readable lead by lead
+        if not self._compress:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlExportWriter:
+
+    def __init__(self, path, fields):
+        self.fields = fields
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, lead):
+        record = {field: lead.get(field) for field in self.fields}
+        if "rating" in record:
+            record["rating"] = parse_rating(record["rating"])
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_many(self, leads):
+        for lead in leads:
+            self.write(lead)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExportWriter:
+    """Buffers up to `chunk_size` leads and writes each chunk as a row group."""
+
+    def __init__(self, path, fields, chunk_size=CHUNK_SIZE):
+        pa, pq = _pyarrow()
+        self._pa = pa
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.schema = pa.schema([
+            (field, pa.float64() if field in FLOAT_FIELDS else pa.string())
+            for field in fields
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self._buffer = []
+
+    def write(self, lead):
+        self._buffer.append(lead)
+        if len(self._buffer) >= self.chunk_size:
+            self._write_buffer()
+
+    def write_many(self, leads):
+        for lead in leads:
+            self.write(lead)
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        columns = []
+        for field in self.fields:
+            values = [lead.get(field) for lead in self._buffer]
+            if field in FLOAT_FIELDS:
+                values = [parse_rating(value) for value in values]
+            else:
+                values = [None if value is None else str(value)
+                          for value in values]
+            columns.append(
+                self._pa.array(values, type=self.schema.field(field).type))
+        self._writer.write_batch(
+            self._pa.record_batch(columns, schema=self.schema))
+        self._buffer = []
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._write_buffer()
+        self._writer.close()
+
+
+def open_export(path, fmt, fields, chunk_size=CHUNK_SIZE):
+    """Open a streaming writer for leads in the given export format."""
+    if fmt == "csv":
+        return CsvExportWriter(path, fields)
+    if fmt == "csv.gz":
+        return CsvExportWriter(path, fields, compress=True)
+    if fmt == "jsonl":
+        return JsonlExportWriter(path, fields)
+    if fmt == "parquet":
+        return ParquetExportWriter(path, fields, chunk_size)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def read_leads(path, chunk_size=CHUNK_SIZE):
+    """Yield the leads in an export file as lists of at most `chunk_size` dicts."""
+    fmt = export_format(path)
+    if fmt == "parquet":
+        _, pq = _pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    if fmt == "csv.gz":
+        file = gzip.open(path, "rt", newline="", encoding="utf-8")
+    else:
+        file = open(path, newline="", encoding="utf-8")
+    with file:
+        rows = csv.DictReader(file) if fmt != "jsonl" else map(
+            json.loads, file)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def merge_exports(sources, path, fmt, fields, chunk_size=CHUNK_SIZE):
+    """
+    Concatenate export files into one, in any mix of formats.
+
+    `sources` yields (path, defaults) pairs; defaults fill columns a source
+    file lacks. Files are read and written a chunk at a time, so memory
+    stays flat however many leads are merged. Returns the lead count.
+    """
+    count = 0
+    writer = open_export(path, fmt, fields, chunk_size)
+    try:
+        for source, defaults in sources:
+            if not os.path.exists(source):
+                logger.warning(f"Skipping missing export file {source}")
+                continue
+            for chunk in read_leads(source, chunk_size):
+                writer.write_many(dict(defaults, **row) for row in chunk)
+                count += len(chunk)
+    finally:
+        writer.close()
+    return count
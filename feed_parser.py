@@ -0,0 +1,78 @@
+import re
+
+from bs4 import BeautifulSoup
+
+LEAD_FIELDS = ["name", "address", "phone", "website", "rating"]
+
+# Returns the markup of the feed's result cards from index arguments[0] on
+# in a single WebDriver round trip, so each scroll only ships the new cards
+FEED_HTML_SCRIPT = (
+    "var cards = document.querySelectorAll("
+    "'div[role=\"feed\"] div[role=\"article\"]');"
+    "var html = [];"
+    "for (var i = arguments[0] || 0; i < cards.length; i++) {"
+    "html.push(cards[i].outerHTML);}"
+    "return html.join('');")
+
+_PRICE_LEVEL = re.compile(r"^[$€£R\s]+$")
+
+
+def _text(element):
+    return element.get_text(" ", strip=True) if element else ""
+
+
+def _line_segments(line):
+    """Split a `W4Efsd` info line into its '·'-separated parts."""
+    segments = []
+    for child in line.find_all("span", recursive=False):
+        text = _text(child).strip("·⋅ ").strip()
+        if text:
+            segments.append(text)
+    return segments
+
+
+def parse_feed_card(card):
+    """Extract the lead fields visible on a single results feed card."""
+    info = dict.fromkeys(LEAD_FIELDS, "")
+
+    link = card.select_one("a.hfpxzc")
+    info["name"] = (card.get("aria-label") or (link or {}).get("aria-label")
+                    or _text(card.select_one(".fontHeadlineSmall")))
+
+    rating = card.select_one("span.MW4etd")
+    if rating:
+        info["rating"] = _text(rating)
+
+    phone = card.select_one("span.UsdlK")
+    if phone:
+        info["phone"] = _text(phone)
+
+    website = card.select_one("a[data-value='Website']")
+    if website:
+        info["website"] = website.get("href", "")
+
+    # The first leaf info line reads "Category · [price] · Address"
+    for line in card.select("div.W4Efsd"):
+        if line.select_one("div.W4Efsd") or line.select_one("span.MW4etd"):
+            continue
+        segments = _line_segments(line)
+        if len(segments) > 1:
+            candidates = [s for s in segments[1:] if not _PRICE_LEVEL.match(s)]
+            if candidates:
+                info["address"] = candidates[-1]
+            break
+
+    info["place_url"] = link.get("href", "") if link else ""
+    return info
+
+
+def parse_feed_html(html):
+    """Parse every result card in feed (or card) markup in one pass."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        parse_feed_card(card) for card in soup.select("div[role='article']")
+    ]
+
+
+def missing_fields(info, fields):
+    return [field for field in fields if not info.get(field)]
@@ -0,0 +1,21 @@
+# Production server config: gunicorn -c gunicorn.conf.py asgi:application
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# One uvicorn event loop serves every client. Jobs, the driver pool and
+# the rate limiter live in this process, so it must stay a single worker;
+# scale scraping out with worker.py and a shared BROKER_URL instead. For
+# the same reason deploy exactly one always-on instance, never behind an
+# autoscaler (see .replit).
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = 1
+
+# With the uvicorn worker this only bounds how long a stuck worker goes
+# unnoticed; lead streams and long-polls are never cut off by it
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 75
+
+accesslog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
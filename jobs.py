@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class Job:
+    """A unit of background work with progress that can be polled."""
+
+    def __init__(self, params, total=None):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = QUEUED
+        self.collected = 0
+        self.total = total
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.leads = []
+        self._cond = threading.Condition()
+        self._listeners = []
+
+    @property
+    def done(self):
+        return self.status in (COMPLETED, FAILED)
+
+    def report_progress(self, collected):
+        self.collected = collected
+
+    def add_listener(self, callback):
+        """
+        Call `callback()` whenever a lead is published or the job finishes,
+        for waiters that cannot block a thread on wait_for_leads(). It runs
+        on the job's worker thread, so it should only hand off a wake-up.
+        """
+        with self._cond:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._cond:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self):
+        self._cond.notify_all()
+        for callback in self._listeners:
+            callback()
+
+    def add_lead(self, lead):
+        """Publish a lead to anyone streaming this job."""
+        with self._cond:
+            self.leads.append(lead)
+            self.collected = max(self.collected, len(self.leads))
+            self._notify()
+
+    def wait_for_leads(self, after, timeout=None):
+        """Leads published after the first `after`, waiting for new ones."""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.leads) > after or self.done,
+                                timeout)
+            return self.leads[after:]
+
+    def wait(self, timeout=None):
+        """Wait for the job to finish; returns whether it has."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout)
+
+    def finish(self, status):
+        with self._cond:
+            self.status = status
+            self.finished_at = time.time()
+            self._notify()
+
+    def progress(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "collected": self.collected,
+            "total": self.total
+        }
+
+    def to_dict(self):
+        data = self.progress()
+        data.update({
+            "params": self.params,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        })
+        return data
+
+
+class JobQueue:
+    """
+    Run jobs on a bounded pool of worker threads.
+
+    Finished jobs are kept in memory for polling; only the most recent
+    `history` of them are retained.
+    """
+
+    def __init__(self, workers=2, history=500):
+        self.workers = max(1, int(workers))
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="job-worker")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, params, total=None):
+        """Queue `fn(job)` and return the Job immediately."""
+        job = Job(params, total=total)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        logger.info(f"Queued job {job.id}")
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def counts(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _run(self, job, fn):
+        job.status = RUNNING
+        job.started_at = time.time()
+        status = FAILED
+        try:
+            job.result = fn(job)
+            status = COMPLETED
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            job.error = str(e)
+        finally:
+            job.finish(status)
+            with self._lock:
+                self._prune()
+
+    def _prune(self):
+        # Drop the oldest finished jobs once the history limit is exceeded
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.done][:excess]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def describe_file(path, chunk_size=1 << 20):
+    """Return (byte size, sha256 hex digest) of a file, read in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+    return size, digest.hexdigest()
+
+
+class RunManifest:
+    """
+    Append-only JSON Lines index of the export files a run produced.
+
+    Each finished run appends one record in a single O_APPEND write, so the
+    file never holds a half-updated index. Readers keep the parsed entries
+    in memory and only parse the bytes appended since their last read, so
+    listing runs costs the same with ten runs or ten thousand. A later
+    record for the same filename replaces the earlier one; a record with
+    "deleted": true removes it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._offset = 0
+        self._inode = None
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def remove(self, filename):
+        self.append({"filename": filename, "deleted": True})
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._entries, self._offset, self._inode = {}, 0, None
+            return
+
+        # The file was compacted or replaced: start over
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._entries, self._offset, self._inode = {}, 0, stat.st_ino
+
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.path, 'rb') as file:
+            file.seek(self._offset)
+            data = file.read(stat.st_size - self._offset)
+
+        # Only consume complete lines; a write in progress is picked up later
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.error(f"Skipping corrupt manifest line in {self.path}")
+                continue
+            if record.get("deleted"):
+                self._entries.pop(record.get("filename"), None)
+            else:
+                # Re-insert so an updated run moves to the newest position
+                self._entries.pop(record["filename"], None)
+                self._entries[record["filename"]] = record
+        self._offset += end
+
+    def get(self, filename):
+        with self._lock:
+            self._refresh()
+            return self._entries.get(filename)
+
+    def latest(self, limit=None, offset=0, **filters):
+        """Newest-first records, optionally filtered on exact field values."""
+        filters = {k: v for k, v in filters.items() if v}
+        results = []
+        skipped = 0
+        with self._lock:
+            self._refresh()
+            for record in reversed(self._entries.values()):
+                if any(record.get(k) != v for k, v in filters.items()):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if limit is not None and len(results) >= limit:
+                    break
+                results.append(record)
+        return results
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def compact(self):
+        """Atomically rewrite the manifest with one line per live entry."""
+        with self._lock:
+            self._refresh()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                for record in self._entries.values():
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+            self._entries, self._offset, self._inode = {}, 0, None
@@ -0,0 +1,145 @@
+import bisect
+import threading
+
+# Seconds; spans a feed parse (milliseconds) up to a whole slow scrape
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+                   30, 60, 120, 300)
+
+
+def _escape(value):
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace(
+        '"', '\\"'))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"'
+                          for name, value in labels) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+
+    def __init__(self, name, help, labelnames):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple((name, labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount, labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}_total", key, value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[0][index] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self):
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (f"{self.name}_bucket", key + (("le", bound), ),
+                       cumulative)
+            yield f"{self.name}_bucket", key + (("le", "+Inf"), ), count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+
+class Gauge(_Metric):
+    """A gauge whose values are read from `collect` at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames, collect):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in self.collect():
+            yield self.name, self._key(labels), value
+
+
+class MetricsRegistry:
+    """
+    Counters, histograms and gauges rendered in the Prometheus text format.
+
+    Metric names get `prefix` prepended. inc() and observe() on a name
+    that was never declared are ignored, so instrumented code does not
+    need to know which metrics are exported.
+    """
+
+    def __init__(self, prefix="leadgen"):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _declare(self, name, metric):
+        self._metrics[name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._declare(
+            name, Counter(f"{self.prefix}_{name}", help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._declare(
+            name, Histogram(f"{self.prefix}_{name}", help, labelnames,
+                            buckets))
+
+    def gauge(self, name, help, labelnames, collect):
+        return self._declare(
+            name, Gauge(f"{self.prefix}_{name}", help, labelnames, collect))
+
+    def inc(self, name, amount=1, **labels):
+        metric = self._metrics.get(name)
+        if isinstance(metric, Counter):
+            with self._lock:
+                metric.inc(amount, labels)
+
+    def observe(self, name, value, **labels):
+        metric = self._metrics.get(name)
+        if isinstance(metric, Histogram):
+            with self._lock:
+                metric.observe(value, labels)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            with self._lock:
+                samples = list(metric.samples())
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                lines.append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,342 @@
+import logging
+import string
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Business name patterns for different types
+BUSINESS_NAME_PATTERNS = {
+    "Mobile phone shop": [
+        "{name}'s Mobile", "{name} Cellular", "Mobile {name}",
+        "Celulares {name}", "{name} Phones", "Tienda {name}"
+    ],
+    "Electronics store": [
+        "{name} Electronics", "Electrónica {name}", "{name} Tech",
+        "Tecnología {name}", "{name} Digital", "Gadgets {name}"
+    ],
+    "Cell phone repair": [
+        "{name} Repairs", "Fix {name}", "Reparaciones {name}",
+        "{name} Cell Fix", "Doctor {name}", "Tech {name} Repair"
+    ],
+    "Mobile accessories": [
+        "{name} Accessories", "Accesorios {name}", "{name} Mobile Gear",
+        "Complémentos {name}", "{name} Mobile Plus",
+        "Tienda {name} Accesorios"
+    ],
+    "Electronics wholesaler": [
+        "{name} Wholesale", "Mayoreo {name}", "{name} Distribuidora",
+        "Distribución {name}", "{name} Bulk Supply", "Mayorista {name}"
+    ],
+    "Telecommunications shop": [
+        "{name} Telecomunicaciones", "{name} Telecom", "Comunicaciones {name}",
+        "{name} Connect", "Telecom {name}", "Conectividad {name}"
+    ]
+}
+
+# Common business names in Latin America
+COMMON_NAMES = [
+    "Garcia", "Martinez", "Lopez", "Gonzalez", "Rodriguez", "Fernandez",
+    "Perez", "Sanchez", "Ramirez", "Torres", "Diaz", "Cruz", "Reyes",
+    "Morales", "Rojas", "Vargas", "Flores", "Gomez", "Herrera", "Romero",
+    "TecnoMax", "Movil", "Celular", "Conecta", "Digital", "Tecno", "Mundo",
+    "Global", "Metro", "Centro", "Plaza", "Express", "Smart", "Pro", "Elite"
+]
+
+# Address patterns based on city
+ADDRESS_PATTERNS = {
+    "Mexico City": ["Av. {street} #{number}, Col. {colony}, CP {postcode}"],
+    "Guadalajara": ["Calle {street} #{number}, {zone}, CP {postcode}"],
+    "Monterrey": ["Blvd. {street} #{number}, {zone}, CP {postcode}"],
+    "São Paulo": ["Rua {street}, {number}, {district}, CEP {postcode}"],
+    "Rio de Janeiro": ["Av. {street}, {number}, {district}, CEP {postcode}"],
+    "Brasília": ["SBS {sector} {block}, {number}, CEP {postcode}"],
+    "Bogotá": ["Calle {street} # {number}-{extra}, {district}, {city}"],
+    "Medellín": ["Carrera {street} # {number}-{extra}, {district}, {city}"],
+    "Cali": ["Avenida {street} # {number}-{extra}, {district}, {city}"],
+    "Buenos Aires": ["Av. {street} {number}, {district}, C.P. {postcode}"],
+    "Córdoba": ["Calle {street} {number}, {district}, C.P. {postcode}"],
+    "Rosario": ["Bv. {street} {number}, {district}, C.P. {postcode}"],
+    "Lima": ["Av. {street} {number}, {district}, {city}"],
+    "Arequipa": ["Calle {street} {number}, {district}, {city}"],
+    "Trujillo": ["Jr. {street} {number}, {district}, {city}"],
+    "Santiago": ["Av. {street} {number}, {district}, {city}"],
+    "Valparaíso": ["Calle {street} {number}, {district}, {city}"],
+    "Concepción": ["Calle {street} {number}, {district}, {city}"]
+}
+
+STREETS = [
+    "Insurgentes", "Reforma", "Revolución", "Hidalgo", "Juárez", "Madero",
+    "Morelos", "Zapata", "Libertad", "Universidad", "Paulista", "Ipiranga",
+    "Amazonas", "Atlântica", "Copacabana", "Bolívar", "Santander", "El Dorado",
+    "Carrera 7", "Septima", "Corrientes", "Santa Fe", "Córdoba", "Mayo",
+    "Callao", "Tacna", "Arequipa", "Larco", "Pardo", "Ejercito"
+]
+COLONIES = ["Centro", "Roma", "Condesa", "Polanco", "Napoles"]
+ZONES = ["Zona 1", "Zona 2", "Zona 10", "Zona Centro", "Zona Sur"]
+DISTRICTS = [
+    "Miraflores", "Barranco", "San Isidro", "Recoleta", "Palermo", "Ipanema",
+    "Copacabana", "Leblon", "Chapinero", "Usaquen"
+]
+SECTORS = ["Q", "N", "S", "W", "E"]
+BLOCK_LETTERS = ["A", "B", "C", "D", "E"]
+
+COUNTRY_CODES = {
+    "Mexico": "+52",
+    "Brazil": "+55",
+    "Colombia": "+57",
+    "Argentina": "+54",
+    "Peru": "+51",
+    "Chile": "+56"
+}
+
+DOMAIN_ENDINGS = [
+    ".com", ".net", ".com.mx", ".com.br", ".com.co", ".com.ar", ".com.pe",
+    ".cl"
+]
+
+WEBSITE_PROBABILITY = 0.7
+
+# Columns of a mock lead, in export order
+MOCK_FIELDS = ["name", "address", "phone", "website", "rating"]
+
+
+def _website_for(business_name, ending):
+    website_name = business_name.lower().replace("'s", "").replace(" ", "")
+    website_name = ''.join(c for c in website_name if c.isalnum())
+    return f"http://www.{website_name}{ending}"
+
+
+def generate_mock_data(country, city, business_type, limit=20, seed=None):
+    """
+    Generate mock data when scraping fails or is not possible.
+
+    Leads come from the batched generator, in the same shape as scraped
+    leads; `seed` makes them reproducible.
+    """
+    logger.info(
+        f"Generating mock data for {business_type} in {city}, {country}")
+    return list(
+        iter_mock_leads(country, city, business_type, limit, seed=seed))
+
+
+def _int_strings(low, high, width=0):
+    """Object array whose i-th entry is str(low + i), zero padded to width."""
+    return np.array([str(i).zfill(width) for i in range(low, high + 1)],
+                    dtype=object)
+
+
+class MockTables:
+    """
+    Everything the batched generator looks up, precomputed once.
+
+    Names, websites and number-to-string conversions are tables indexed by
+    random integers, so generating a batch is a handful of NumPy fancy
+    indexing and element-wise concatenation passes instead of per-lead
+    formatting in Python.
+    """
+
+    def __init__(self):
+        patterns = sorted({p for ps in BUSINESS_NAME_PATTERNS.values()
+                           for p in ps})
+        self.pattern_index = {p: i for i, p in enumerate(patterns)}
+        self.names = np.array(
+            [[p.format(name=n) for n in COMMON_NAMES] for p in patterns],
+            dtype=object)
+        self.websites = np.array(
+            [[[_website_for(name, ending) for ending in DOMAIN_ENDINGS]
+              for name in row] for row in self.names],
+            dtype=object)
+
+        self.num_3 = _int_strings(100, 999)
+        self.num_4 = _int_strings(0, 9999, width=4)
+        self.num_2 = _int_strings(10, 99)
+        self.house_numbers = _int_strings(100, 9999)
+        self.postcodes = _int_strings(10000, 99999)
+        self.blocks = np.array(
+            [f"{letter}{i}" for letter in BLOCK_LETTERS for i in range(1, 21)],
+            dtype=object)
+        self.choices = {
+            "street": np.array(STREETS, dtype=object),
+            "colony": np.array(COLONIES, dtype=object),
+            "zone": np.array(ZONES, dtype=object),
+            "district": np.array(DISTRICTS, dtype=object),
+            "sector": np.array(SECTORS, dtype=object),
+            "block": self.blocks,
+            "number": self.house_numbers,
+            "extra": self.num_2,
+            "postcode": self.postcodes
+        }
+        self.street_numbers = _prefixed("Calle Principal #",
+                                        self.house_numbers)
+        self.phone_prefixes = {}
+        self.layouts = {}
+
+    def phone_prefix(self, country_code):
+        """Table of "<code> ddd " strings for one country code."""
+        if country_code not in self.phone_prefixes:
+            self.phone_prefixes[country_code] = _prefixed(
+                f"{country_code} ", self.num_3 + " ")
+        return self.phone_prefixes[country_code]
+
+    def layout(self, template, city):
+        """
+        Compile an address template into (tables, suffix) for _join.
+
+        Each literal is prepended to the table of the field that follows
+        it; {city} is constant and folds into the surrounding literal.
+        """
+        key = (template, city)
+        if key not in self.layouts:
+            tables = []
+            literal = ""
+            for text, field, _, _ in string.Formatter().parse(template):
+                literal += text
+                if field == "city":
+                    literal += city
+                elif field:
+                    tables.append(_prefixed(literal, self.choices[field]))
+                    literal = ""
+            self.layouts[key] = (tables, literal)
+        return self.layouts[key]
+
+
+_tables = None
+
+
+def mock_tables():
+    global _tables
+    if _tables is None:
+        _tables = MockTables()
+    return _tables
+
+
+def _join(tables, rng, size, suffix=""):
+    """
+    Element-wise join of one random entry from each table, plus a suffix.
+
+    Literal text is already folded into the tables, so a lead costs one
+    concatenation pass per random field.
+    """
+    result = None
+    for table in tables:
+        column = table[rng.integers(0, len(table), size)]
+        result = column if result is None else result + column
+    return result + suffix if suffix else result
+
+
+def _prefixed(prefix, table):
+    return np.array([prefix + value for value in table], dtype=object)
+
+
+def mock_lead_batch(country, city, business_type, size, rng=None):
+    """
+    Generate `size` mock leads as columns: a dict of NumPy arrays.
+
+    Text columns are object arrays of str; rating is float64.
+    """
+    rng = rng or np.random.default_rng()
+    tables = mock_tables()
+
+    patterns = BUSINESS_NAME_PATTERNS.get(
+        business_type, BUSINESS_NAME_PATTERNS["Mobile phone shop"])
+    pattern_ids = np.array([tables.pattern_index[p] for p in patterns])
+    pattern_idx = pattern_ids[rng.integers(0, len(pattern_ids), size)]
+    name_idx = rng.integers(0, len(COMMON_NAMES), size)
+    names = tables.names[pattern_idx, name_idx]
+
+    if city in ADDRESS_PATTERNS:
+        templates = ADDRESS_PATTERNS[city]
+        address = np.empty(size, dtype=object)
+        template_idx = rng.integers(0, len(templates), size)
+        for i, template in enumerate(templates):
+            mask = template_idx == i
+            count = int(mask.sum())
+            if count:
+                layout, suffix = tables.layout(template, city)
+                address[mask] = _join(layout, rng, count, suffix)
+    else:
+        address = _join([tables.street_numbers], rng, size,
+                        f", {city}, {country}")
+
+    country_code = COUNTRY_CODES.get(country, "+1")
+    phone = _join(
+        [tables.phone_prefix(country_code), tables.num_3, tables.num_4], rng,
+        size)
+
+    has_website = rng.random(size) < WEBSITE_PROBABILITY
+    websites = tables.websites[pattern_idx, name_idx,
+                               rng.integers(0, len(DOMAIN_ENDINGS), size)]
+    website = np.where(has_website, websites, "")
+
+    rating = np.round(rng.uniform(3.0, 5.0, size), 1)
+
+    return {
+        "name": names,
+        "address": address,
+        "phone": phone,
+        "website": website,
+        "rating": rating
+    }
+
+
+def mock_lead_batches(country,
+                      city,
+                      business_type,
+                      total,
+                      batch_size=100_000,
+                      seed=None):
+    """Yield column batches until `total` leads have been generated."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, batch_size):
+        yield mock_lead_batch(country, city, business_type,
+                              min(batch_size, total - start), rng)
+
+
+def iter_mock_leads(country,
+                    city,
+                    business_type,
+                    total,
+                    batch_size=100_000,
+                    seed=None):
+    """Stream mock leads as row dicts in the same shape as scraped leads."""
+    for batch in mock_lead_batches(country, city, business_type, total,
+                                   batch_size, seed):
+        ratings = batch["rating"].astype(str).tolist()
+        for row in zip(batch["name"].tolist(), batch["address"].tolist(),
+                       batch["phone"].tolist(), batch["website"].tolist(),
+                       ratings):
+            yield dict(zip(MOCK_FIELDS, row))
+
+
+def write_mock_parquet(path,
+                       country,
+                       city,
+                       business_type,
+                       total,
+                       batch_size=100_000,
+                       seed=None):
+    """
+    Write `total` mock leads to a Parquet file one batch at a time.
+
+    Requires the optional pyarrow package.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires pyarrow to be installed")
+
+    schema = pa.schema([("name", pa.string()), ("address", pa.string()),
+                        ("phone", pa.string()), ("website", pa.string()),
+                        ("rating", pa.float64())])
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in mock_lead_batches(country, city, business_type, total,
+                                       batch_size, seed):
+            writer.write_batch(
+                pa.record_batch([
+                    pa.array(batch[field], type=schema.field(field).type)
+                    for field in schema.names
+                ],
+                                schema=schema))
+    return path
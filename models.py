@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+db = SQLAlchemy(model_class=Base)
+
+
+class Run(db.Model):
+    """One /scrape or /batch run and the export file it produced."""
+    __tablename__ = "runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    query = db.Column(db.String(500), nullable=False)
+    country = db.Column(db.String(100), index=True)
+    city = db.Column(db.String(100), index=True)
+    business_type = db.Column(db.String(100), index=True)
+    lead_limit = db.Column(db.Integer)
+    lead_count = db.Column(db.Integer, nullable=False, default=0)
+    source = db.Column(db.String(20))
+    filename = db.Column(db.String(255), unique=True)
+    duration = db.Column(db.Float)
+    created_at = db.Column(db.DateTime,
+                           nullable=False,
+                           default=datetime.now,
+                           index=True)
+
+    leads = db.relationship("Lead",
+                            back_populates="run",
+                            cascade="all, delete-orphan",
+                            passive_deletes=True)
+
+
+class Lead(db.Model):
+    __tablename__ = "leads"
+    __table_args__ = (
+        db.Index("ix_leads_location_type", "country", "city",
+                 "business_type"),
+        # Keyset pagination of a run's leads, in order or by rating
+        db.Index("ix_leads_run_id_id", "run_id", "id"),
+        db.Index("ix_leads_run_rating", "run_id", "rating", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer,
+                       db.ForeignKey("runs.id", ondelete="CASCADE"),
+                       nullable=False,
+                       index=True)
+    name = db.Column(db.String(255), nullable=False)
+    address = db.Column(db.String(500))
+    phone = db.Column(db.String(50))
+    website = db.Column(db.String(500))
+    rating = db.Column(db.Float)
+    country = db.Column(db.String(100), index=True)
+    city = db.Column(db.String(100), index=True)
+    business_type = db.Column(db.String(100), index=True)
+    created_at = db.Column(db.DateTime,
+                           nullable=False,
+                           default=datetime.now,
+                           index=True)
+
+    run = db.relationship("Run", back_populates="leads")
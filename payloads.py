@@ -0,0 +1,152 @@
+import json
+import logging
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Maps prefixes its JSON responses with this to defeat JSON hijacking
+PAYLOAD_PREFIX = ")]}'"
+
+PLACE_URL = "https://www.google.com/maps/place/data=!4m2!3m1!1s{data_id}"
+
+# Installed with Page.addScriptToEvaluateOnNewDocument so it runs before the
+# page's own scripts: keeps the body of every search response the page
+# fetches, for DRAIN_PAYLOADS_SCRIPT to collect
+CAPTURE_SCRIPT = """
+(function () {
+  if (window.__leadgenPayloads) return;
+  window.__leadgenPayloads = [];
+  var keep = function (url, text) {
+    if (url && url.indexOf('tbm=map') !== -1) {
+      window.__leadgenPayloads.push(text);
+    }
+  };
+  var open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__leadgenUrl = String(url);
+    return open.apply(this, arguments);
+  };
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    this.addEventListener('load', function () {
+      try { keep(this.__leadgenUrl, this.responseText); } catch (e) {}
+    });
+    return send.apply(this, arguments);
+  };
+  var originalFetch = window.fetch;
+  if (originalFetch) {
+    window.fetch = function (input) {
+      var url = typeof input === 'string' ? input : (input && input.url);
+      return originalFetch.apply(this, arguments).then(function (response) {
+        if (url && url.indexOf('tbm=map') !== -1) {
+          response.clone().text().then(function (text) { keep(url, text); });
+        }
+        return response;
+      });
+    };
+  }
+})();
+"""
+
+# Returns the captured response bodies not collected yet. The first call on
+# a page also returns the results embedded in it, which is where a search
+# URL's first page of results arrives.
+DRAIN_PAYLOADS_SCRIPT = """
+var payloads = (window.__leadgenPayloads || []).splice(0);
+if (!window.__leadgenInitialRead) {
+  window.__leadgenInitialRead = true;
+  var state = window.APP_INITIALIZATION_STATE;
+  ((state && state[3]) || []).forEach(function (value) {
+    if (typeof value === 'string' && value.indexOf(")]}'") === 0) {
+      payloads.unshift(value);
+    }
+  });
+}
+return payloads;
+"""
+
+
+def install_capture(driver):
+    """Start capturing search responses on this driver's future pages."""
+    if getattr(driver, "_leadgen_capture", False):
+        return True
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                               {"source": CAPTURE_SCRIPT})
+        driver._leadgen_capture = True
+        return True
+    except Exception as e:
+        logger.error(f"Could not install response capture: {str(e)}")
+        return False
+
+
+def _dig(value, *path):
+    """value[a][b]... or None as soon as an index is missing."""
+    for index in path:
+        if not isinstance(value, list) or not -len(value) <= index < len(
+                value):
+            return None
+        value = value[index]
+    return value
+
+
+def _decode(text):
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-6]
+    # Older responses wrap the payload in a {"c": 0, "d": "..."} envelope
+    if text.startswith("{"):
+        text = json.loads(text).get("d", "").strip()
+    if text.startswith(PAYLOAD_PREFIX):
+        text = text[len(PAYLOAD_PREFIX):]
+    return json.loads(text)
+
+
+def _places(data):
+    """The place arrays in a decoded search response."""
+    for path in ((0, 1), (64, )):
+        entries = _dig(data, *path)
+        if not isinstance(entries, list):
+            continue
+        places = [
+            _dig(entry, 14) for entry in entries
+            if isinstance(_dig(entry, 14, 11), str)
+        ]
+        if places:
+            return places
+    return []
+
+
+def _website(url):
+    # Some sites are listed through Google's redirect
+    if url and url.startswith("/url?"):
+        url = (parse_qs(urlparse(url).query).get("q") or [""])[0]
+    return url or ""
+
+
+def place_lead(place):
+    """One lead, in the feed parser's fields, from a place array."""
+    rating = _dig(place, 4, 7)
+    data_id = _dig(place, 10)
+    address = _dig(place, 39)
+    if not isinstance(address, str):
+        lines = _dig(place, 2) or []
+        address = ", ".join(line for line in lines if isinstance(line, str))
+    return {
+        "name": _dig(place, 11) or "",
+        "address": address or "",
+        "phone": _dig(place, 178, 0, 0) or "",
+        "website": _website(_dig(place, 7, 0)),
+        "rating": str(rating) if isinstance(rating, (int, float)) else "",
+        "place_url": PLACE_URL.format(data_id=data_id) if data_id else ""
+    }
+
+
+def parse_search_payload(text):
+    """Every listing in one captured search response, or [] if unreadable."""
+    try:
+        data = _decode(text)
+    except (ValueError, AttributeError) as e:
+        logger.debug(f"Unreadable search payload: {str(e)}")
+        return []
+    return [place_lead(place) for place in _places(data)]
@@ -0,0 +1,171 @@
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus
+
+from resume import lead_identity
+
+logger = logging.getLogger(__name__)
+
+# Approximate (south, west, north, east) of each city's built-up area
+CITY_BOUNDS = {
+    ("Mexico", "Mexico City"): (19.20, -99.35, 19.60, -98.94),
+    ("Mexico", "Guadalajara"): (20.55, -103.45, 20.77, -103.25),
+    ("Mexico", "Monterrey"): (25.58, -100.42, 25.78, -100.18),
+    ("Brazil", "São Paulo"): (-23.75, -46.83, -23.45, -46.36),
+    ("Brazil", "Rio de Janeiro"): (-23.08, -43.80, -22.80, -43.10),
+    ("Brazil", "Brasília"): (-15.90, -48.05, -15.70, -47.80),
+    ("Colombia", "Bogotá"): (4.47, -74.22, 4.83, -74.01),
+    ("Colombia", "Medellín"): (6.16, -75.64, 6.34, -75.52),
+    ("Colombia", "Cali"): (3.33, -76.58, 3.50, -76.46),
+    ("Argentina", "Buenos Aires"): (-34.71, -58.53, -34.53, -58.33),
+    ("Argentina", "Córdoba"): (-31.49, -64.29, -31.31, -64.09),
+    ("Argentina", "Rosario"): (-33.03, -60.78, -32.87, -60.62),
+    ("Peru", "Lima"): (-12.25, -77.15, -11.90, -76.90),
+    ("Peru", "Arequipa"): (-16.47, -71.60, -16.33, -71.47),
+    ("Peru", "Trujillo"): (-8.16, -79.08, -8.05, -78.98),
+    ("Chile", "Santiago"): (-33.62, -70.80, -33.33, -70.50),
+    ("Chile", "Valparaíso"): (-33.08, -71.66, -33.01, -71.58),
+    ("Chile", "Concepción"): (-36.87, -73.10, -36.77, -73.00)
+}
+
+MAPS_SEARCH_URL = ("https://www.google.com/maps/search/{query}/"
+                   "@{lat:.5f},{lng:.5f},{zoom}z")
+
+
+class Tile:
+    """A rectangle of the map searched as one Maps viewport."""
+
+    def __init__(self, south, west, north, east, depth=0):
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.depth = depth
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def zoom(self, viewport_px=1280):
+        """The deepest zoom level whose viewport still covers the tile."""
+        lat, _ = self.center
+        # Degrees of longitude shown across the viewport at zoom 0; a degree
+        # of latitude is wider on screen away from the equator
+        span = max(self.east - self.west,
+                   (self.north - self.south) / math.cos(math.radians(lat)))
+        zoom = math.floor(math.log2(viewport_px * 360 / 256 / span))
+        return max(3, min(18, zoom))
+
+    def search_url(self, query, viewport_px=1280):
+        lat, lng = self.center
+        return MAPS_SEARCH_URL.format(query=quote_plus(query),
+                                      lat=lat,
+                                      lng=lng,
+                                      zoom=self.zoom(viewport_px))
+
+    def split(self):
+        """The four quadrants of this tile, one level deeper."""
+        lat, lng = self.center
+        return [
+            Tile(south, west, north, east, self.depth + 1)
+            for south, north in ((self.south, lat), (lat, self.north))
+            for west, east in ((self.west, lng), (lng, self.east))
+        ]
+
+    def __repr__(self):
+        return (f"Tile({self.south:.4f}, {self.west:.4f}, {self.north:.4f}, "
+                f"{self.east:.4f}, depth={self.depth})")
+
+
+def city_tile(country, city):
+    """The root tile covering a city, or None if its bounds are unknown."""
+    bounds = CITY_BOUNDS.get((country, city))
+    return Tile(*bounds) if bounds else None
+
+
+class TilePlanner:
+    """
+    Cover a city with viewport searches to get past the cap on how many
+    results one Maps search returns.
+
+    The city is searched as one tile first. Each tile asks for at most
+    `tile_limit` results, and no more than the leads still needed. A tile
+    whose search came back full is split into quadrants for the next
+    round, but only if it also turned up leads no earlier tile had; a tile
+    with room to spare already covered its area. Each round's tiles run in
+    parallel on `workers` threads through `scrape(query, limit, start_url)`.
+    """
+
+    def __init__(self,
+                 scrape,
+                 workers=2,
+                 tile_limit=120,
+                 max_depth=3,
+                 viewport_px=1280):
+        self.scrape = scrape
+        self.workers = max(1, int(workers))
+        self.tile_limit = tile_limit
+        self.max_depth = max_depth
+        self.viewport_px = viewport_px
+
+    def _scrape_tile(self, query, tile, tile_limit):
+        return self.scrape(query, tile_limit,
+                           tile.search_url(query, self.viewport_px))
+
+    def run(self, query, root, limit, on_lead=None):
+        """
+        Return (leads, stats): up to `limit` distinct leads for `query`
+        within `root`, passed to `on_lead` as they are found.
+        """
+        leads = []
+        seen = set()
+        stats = {"tiles": 0, "split": 0, "depth": 0, "new_by_depth": []}
+        frontier = [root]
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="tile-worker") as pool:
+            while frontier and len(leads) < limit:
+                depth = frontier[0].depth
+                stats["depth"] = depth
+                stats["new_by_depth"].append(0)
+                # Reading a full tile_limit of cards only pays off when the
+                # leads still needed could fill it
+                tile_limit = min(self.tile_limit, limit - len(leads))
+                futures = {
+                    pool.submit(self._scrape_tile, query, tile, tile_limit):
+                    tile
+                    for tile in frontier
+                }
+                frontier = []
+
+                for future in as_completed(futures):
+                    tile = futures[future]
+                    try:
+                        found = future.result() or []
+                    except Exception as e:
+                        logger.error(f"Tile {tile} failed: {str(e)}")
+                        found = []
+                    stats["tiles"] += 1
+
+                    new = 0
+                    for lead in found:
+                        identity = lead_identity(lead)
+                        if identity in seen:
+                            continue
+                        seen.add(identity)
+                        new += 1
+                        if len(leads) < limit:
+                            leads.append(lead)
+                            if on_lead:
+                                on_lead(lead)
+                    stats["new_by_depth"][depth] += new
+                    logger.info(f"{tile}: {len(found)} leads, {new} new")
+
+                    if (len(found) >= tile_limit and new
+                            and depth < self.max_depth
+                            and len(leads) < limit):
+                        frontier.extend(tile.split())
+                        stats["split"] += 1
+
+        return leads, stats
@@ -0,0 +1,226 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BlockSignal(Exception):
+    """A page state that suggests Maps is throttling or blocking us."""
+
+
+class CircuitOpenError(Exception):
+    """Scraping is paused and did not resume within the allowed wait."""
+
+
+class _MemoryState:
+    """Limiter state for the threads of one process."""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def update(self, key, initial):
+        with self._lock:
+            yield self._states.setdefault(key, dict(initial))
+
+
+class _SqliteState:
+    """Limiter state shared by every process that opens the same file."""
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_state (
+                    key TEXT PRIMARY KEY,
+                    state TEXT NOT NULL
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def update(self, key, initial):
+        with closing(self._connect()) as conn:
+            # Take the write lock up front so read-modify-write is atomic
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT state FROM rate_limit_state WHERE key = ?",
+                    (key, )).fetchone()
+                state = json.loads(row[0]) if row else dict(initial)
+                yield state
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_state (key, state) "
+                    "VALUES (?, ?)", (key, json.dumps(state)))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket whose rate follows how Maps responds, with a circuit
+    breaker that pauses every scrape once Maps starts blocking.
+
+    Each success raises the rate by `increase` per second up to
+    `max_rate`; each block signal multiplies it by `decrease` down to
+    `min_rate`. After `threshold` block signals in a row the circuit opens
+    and acquire() waits out `cooldown` seconds, doubling (up to
+    `max_cooldown`) each time it reopens. Then a single probe scrape is let
+    through: success closes the circuit at `min_rate`, another block
+    signal opens it again.
+
+    With a `path`, the state lives in a SQLite file, so every worker
+    process on the node shares one bucket and one breaker.
+    """
+
+    def __init__(self,
+                 key,
+                 rate=0.5,
+                 burst=2,
+                 min_rate=0.05,
+                 max_rate=1.0,
+                 increase=0.02,
+                 decrease=0.5,
+                 threshold=3,
+                 cooldown=300,
+                 max_cooldown=3600,
+                 probe_timeout=300,
+                 path=None):
+        self.key = key
+        self.burst = max(1.0, float(burst))
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.initial = {
+            "tokens": self.burst,
+            "updated": time.time(),
+            "rate": float(rate),
+            "failures": 0,
+            "open_until": 0.0,
+            "cooldown": float(cooldown),
+            "probe_until": 0.0,
+            "last_signal": None
+        }
+        self._store = _SqliteState(path) if path else _MemoryState()
+
+    @staticmethod
+    def _circuit(state, now):
+        if not state["open_until"]:
+            return CLOSED
+        return OPEN if now < state["open_until"] else HALF_OPEN
+
+    def _try_acquire(self, now):
+        """Take a token; otherwise return how long to wait before retrying."""
+        with self._store.update(self.key, self.initial) as state:
+            circuit = self._circuit(state, now)
+            if circuit == OPEN:
+                return state["open_until"] - now
+            if circuit == HALF_OPEN:
+                if now < state["probe_until"]:
+                    # Someone else's probe is deciding; check back shortly
+                    return min(5.0, state["probe_until"] - now)
+                state["probe_until"] = now + self.probe_timeout
+                logger.info(f"Circuit for {self.key} half open; probing")
+                return 0
+
+            # Stored state may predate a change to the configured bounds
+            state["rate"] = min(self.max_rate,
+                                max(self.min_rate, state["rate"]))
+            elapsed = max(0.0, now - state["updated"])
+            state["tokens"] = min(self.burst,
+                                  state["tokens"] + elapsed * state["rate"])
+            state["updated"] = now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0
+            return (1 - state["tokens"]) / state["rate"]
+
+    def acquire(self, timeout=None):
+        """Block until a scrape may start; False if `timeout` runs out."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            wait = self._try_acquire(time.time())
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def record_success(self):
+        now = time.time()
+        with self._store.update(self.key, self.initial) as state:
+            circuit = self._circuit(state, now)
+            if circuit == OPEN:
+                # A scrape that started before the pause; only a scrape
+                # after the cooldown can tell whether Maps has recovered
+                return
+            if circuit == HALF_OPEN:
+                logger.info(f"Circuit for {self.key} closed")
+                state.update(open_until=0.0,
+                             probe_until=0.0,
+                             rate=self.min_rate,
+                             cooldown=float(self.base_cooldown))
+            else:
+                state["rate"] = min(self.max_rate,
+                                    state["rate"] + self.increase)
+            state["failures"] = 0
+
+    def record_block(self, signal):
+        """
+        Slow down after a block signal; returns True if this opened the
+        circuit.
+        """
+        now = time.time()
+        with self._store.update(self.key, self.initial) as state:
+            state["last_signal"] = signal
+            state["rate"] = max(self.min_rate,
+                                state["rate"] * self.decrease)
+            state["tokens"] = min(state["tokens"], 0.0)
+            circuit = self._circuit(state, now)
+            if circuit == CLOSED:
+                state["failures"] += 1
+                if state["failures"] < self.threshold:
+                    return False
+            elif circuit == OPEN or not state["probe_until"]:
+                # Scrapes still running from before the pause only slow
+                # the rate; reopening is for a failed probe
+                return False
+
+            cooldown = state["cooldown"]
+            state.update(open_until=now + cooldown,
+                         probe_until=0.0,
+                         failures=0,
+                         cooldown=min(self.max_cooldown, cooldown * 2))
+        logger.warning(f"Circuit for {self.key} opened for {cooldown:.0f}s "
+                       f"after block signal: {signal}")
+        return True
+
+    def snapshot(self):
+        now = time.time()
+        with self._store.update(self.key, self.initial) as state:
+            snapshot = dict(state)
+        snapshot["circuit"] = self._circuit(snapshot, now)
+        snapshot["paused_for"] = max(0.0, snapshot["open_until"] - now)
+        return snapshot
@@ -0,0 +1,110 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query):
+    """Case-fold and collapse whitespace so equivalent searches share a key."""
+    query = unicodedata.normalize("NFKC", query or "")
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of scrape results keyed on (query, limit).
+
+    Entries expire after `ttl` seconds and the least recently used ones
+    are evicted once more than `max_entries` are stored. A cached run for a
+    larger limit also answers requests for a smaller one.
+    """
+
+    def __init__(self, path, ttl=86400, max_entries=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    query TEXT NOT NULL,
+                    result_limit INTEGER NOT NULL,
+                    results TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (query, result_limit)
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_query_cache_accessed "
+                         "ON query_cache (accessed_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, query, limit):
+        """Return cached results for the query, or None on a miss."""
+        key = normalize_query(query)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT result_limit, results FROM query_cache "
+                "WHERE query = ? AND result_limit >= ? AND created_at >= ? "
+                "ORDER BY result_limit LIMIT 1",
+                (key, limit, now - self.ttl)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            conn.execute(
+                "UPDATE query_cache SET accessed_at = ? "
+                "WHERE query = ? AND result_limit = ?", (now, key, row[0]))
+
+        self._count("hits")
+        return json.loads(row[1])[:limit]
+
+    def set(self, query, limit, results):
+        key = normalize_query(query)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO query_cache "
+                "(query, result_limit, results, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, limit, json.dumps(results, ensure_ascii=False), now,
+                 now))
+            conn.execute("DELETE FROM query_cache WHERE created_at < ?",
+                         (now - self.ttl, ))
+            evicted = conn.execute(
+                "DELETE FROM query_cache WHERE rowid IN ("
+                "SELECT rowid FROM query_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)", (self.max_entries, )).rowcount
+        self._count("writes")
+        if evicted:
+            with self._lock:
+                self.stats["evictions"] += evicted
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM query_cache")
+
+    def snapshot(self):
+        with closing(self._connect()) as conn:
+            entries = conn.execute(
+                "SELECT COUNT(*) FROM query_cache").fetchone()[0]
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["entries"] = entries
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0
+        return stats
@@ -0,0 +1,107 @@
+import json
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+from result_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+# The place's feature id, "!1s0x<hex>:0x<hex>", in the data part of a
+# place URL; feed card links and URLs built from search responses differ
+# in everything else
+FEATURE_ID = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)", re.I)
+
+
+def lead_identity(info):
+    """
+    Stable identity for a business: the feature id in its Maps place URL,
+    else the URL itself, else name+address.
+    """
+    place_url = info.get("place_url")
+    if place_url:
+        match = FEATURE_ID.search(place_url)
+        if match:
+            return match.group(1).lower()
+        # Drop the query string and tracking suffixes, keep the place path
+        return place_url.split("?")[0]
+    return normalize_query(f"{info.get('name', '')}|{info.get('address', '')}")
+
+
+class ScrapeCursor:
+    """How far a query's results feed has been read, and what was seen."""
+
+    def __init__(self, offset=0, seen=None, exhausted=False):
+        self.offset = offset
+        self.seen = set(seen or ())
+        self.exhausted = exhausted
+
+    def to_dict(self):
+        return {
+            "offset": self.offset,
+            "seen": sorted(self.seen),
+            "exhausted": self.exhausted
+        }
+
+    def update(self, other):
+        self.offset = other.offset
+        self.seen = other.seen
+        self.exhausted = other.exhausted
+
+
+class ProgressStore:
+    """
+    Remember the leads collected so far for each query and where in the
+    feed the scrape stopped, so a later request for more leads only
+    fetches the difference.
+    """
+
+    def __init__(self, path, ttl=86400):
+        self.path = path
+        self.ttl = ttl
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_progress (
+                    query TEXT PRIMARY KEY,
+                    leads TEXT NOT NULL,
+                    seen TEXT NOT NULL,
+                    feed_offset INTEGER NOT NULL,
+                    exhausted INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, query):
+        """Return (leads, cursor) for the query; empty if unknown or stale."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT leads, seen, feed_offset, exhausted FROM "
+                "scrape_progress WHERE query = ? AND updated_at >= ?",
+                (normalize_query(query), time.time() - self.ttl)).fetchone()
+        if row is None:
+            return [], ScrapeCursor()
+        leads, seen, offset, exhausted = row
+        return json.loads(leads), ScrapeCursor(offset, json.loads(seen),
+                                               bool(exhausted))
+
+    def save(self, query, leads, cursor):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_progress "
+                "(query, leads, seen, feed_offset, exhausted, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_query(query), json.dumps(leads, ensure_ascii=False),
+                 json.dumps(sorted(cursor.seen)), cursor.offset,
+                 int(cursor.exhausted), time.time()))
+
+    def forget(self, query):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM scrape_progress WHERE query = ?",
+                         (normalize_query(query), ))
@@ -0,0 +1,34 @@
+from browser import ProfileSlots
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def test_processes_sharing_a_directory_get_different_slots(tmp_path):
+    # Each ProfileSlots stands in for one process on the node
+    app_slots = ProfileSlots(tmp_path)
+    worker_slots = ProfileSlots(tmp_path)
+    first, first_path = app_slots.claim()
+    second, second_path = worker_slots.claim()
+    assert first != second
+    assert first_path != second_path
+
+
+def test_quitting_the_driver_releases_its_slot(tmp_path):
+    slots = ProfileSlots(tmp_path)
+    other = ProfileSlots(tmp_path)
+    slot, _ = slots.claim()
+    driver = FakeDriver()
+    slots.bind(driver, slot)
+    assert other.claim()[0] != slot
+
+    driver.quit()
+    assert driver.quits == 1
+    assert slots.snapshot() == {"claimed": []}
+    assert ProfileSlots(tmp_path).claim()[0] == slot
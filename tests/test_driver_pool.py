@@ -0,0 +1,59 @@
+import threading
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.healthy = True
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def quit(self):
+        pass
+
+
+class GuardedStats(dict):
+    """Stats dict that fails any update made without the pool lock."""
+
+    def __init__(self, pool):
+        super().__init__(pool.stats)
+        self.pool = pool
+
+    def __setitem__(self, key, value):
+        assert self.pool._cond._is_owned(), f"{key} updated without the lock"
+        super().__setitem__(key, value)
+
+
+def test_stats_are_only_updated_under_the_pool_lock():
+    pool = DriverPool(FakeDriver, size=2, max_uses=3, acquire_timeout=5)
+    pool.stats = GuardedStats(pool)
+    rounds, threads = 50, 4
+
+    def borrow():
+        for _ in range(rounds):
+            with pool.driver() as driver:
+                assert driver is not None
+
+    workers = [threading.Thread(target=borrow) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    pooled = pool.acquire()
+    pool.release(pooled, broken=True)
+    pooled = pool.acquire()
+    pooled.driver.healthy = False
+    pool.release(pooled)
+    assert pool.acquire() is not None
+    pool.close()
+
+    stats = pool.snapshot()
+    assert stats["acquired"] == rounds * threads + 3
+    assert stats["crashed"] == 2
+    assert stats["created"] - stats["recycled"] <= pool.size
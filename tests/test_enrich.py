@@ -0,0 +1,93 @@
+import pytest
+
+from enrich import MAX_REDIRECTS, WebsiteEnricher, check_url
+
+
+class FakeResponse:
+
+    def __init__(self, status=200, location=None, body=b"<html></html>"):
+        self.status = status
+        self.headers = {"Content-Type": "text/html"}
+        self._location = location
+        self._body = body
+
+    def get_redirect_location(self):
+        return self._location
+
+    def read(self, amount=None):
+        return self._body
+
+    def drain_conn(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeHTTP:
+    """Answers each URL from `routes`; records what was requested."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requested = []
+
+    def request(self, method, url, **kwargs):
+        self.requested.append(url)
+        return self.routes[url]
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/",
+    "http://localhost:8080/",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.7/",
+    "http://192.168.1.1/",
+    "http://[::1]/",
+    "http://[::ffff:127.0.0.1]/",
+    "http://0.0.0.0/",
+    "ftp://93.184.216.34/",
+])
+def test_non_public_urls_are_rejected(url):
+    with pytest.raises(ValueError):
+        check_url(url)
+
+
+def test_public_address_is_allowed():
+    check_url("https://93.184.216.34/contact")
+
+
+def test_redirect_into_a_private_network_is_not_followed():
+    enricher = WebsiteEnricher()
+    enricher.http = FakeHTTP({
+        "http://93.184.216.34/":
+        FakeResponse(302, location="http://169.254.169.254/latest/"),
+    })
+    with pytest.raises(ValueError):
+        enricher.fetch("http://93.184.216.34/")
+    assert enricher.http.requested == ["http://93.184.216.34/"]
+
+
+def test_public_redirects_are_followed_to_the_page():
+    enricher = WebsiteEnricher()
+    enricher.http = FakeHTTP({
+        "http://93.184.216.34/":
+        FakeResponse(301, location="https://93.184.216.34/home"),
+        "https://93.184.216.34/home":
+        FakeResponse(body=b"<p>hola</p>"),
+    })
+    assert enricher.fetch("http://93.184.216.34/") == (
+        "https://93.184.216.34/home", b"<p>hola</p>")
+
+
+def test_redirect_loops_stop():
+    enricher = WebsiteEnricher()
+    enricher.http = FakeHTTP({
+        "http://93.184.216.34/":
+        FakeResponse(302, location="http://93.184.216.34/"),
+    })
+    with pytest.raises(ValueError):
+        enricher.fetch("http://93.184.216.34/")
+    assert len(enricher.http.requested) == MAX_REDIRECTS + 1
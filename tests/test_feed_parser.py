@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from feed_parser import parse_feed_html
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures",
+    "maps_feed.html")
+
+
+@pytest.fixture(scope="module")
+def feed_html():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def cards(feed_html):
+    return {card["name"]: card for card in parse_feed_html(feed_html)}
+
+
+def test_every_card_is_parsed_in_feed_order(feed_html):
+    names = [card["name"] for card in parse_feed_html(feed_html)]
+    assert names == [
+        "Celulares Lima Centro",
+        "Tecno Max Miraflores",
+        "Mundo Celular",
+        "Reparaciones Express Surco",
+        "Accesorios Garcia",
+        "Smart Movil San Isidro",
+    ]
+
+
+def test_full_card(cards):
+    assert cards["Celulares Lima Centro"] == {
+        "name": "Celulares Lima Centro",
+        "address": "Jr. de la Unión 123",
+        "phone": "01 4271234",
+        "website": "https://celulareslima.pe/",
+        "rating": "4.5",
+        "place_url": (
+            "https://www.google.com/maps/place/Celulares+Lima+Centro/"
+            "data=!4m7!3m6!1s0x9105c8b5d35662c7:0x15f0bb8e8bf0a6ef"
+            "!8m2!3d-12.05!4d-77.03!16s%2Fg%2F11c1r9a6ef"),
+    }
+
+
+@pytest.mark.parametrize("name, address", [
+    ("Tecno Max Miraflores", "Av. José Larco 812"),
+    ("Smart Movil San Isidro", "Av. Javier Prado Este 1066"),
+])
+def test_price_level_is_not_taken_for_the_address(cards, name, address):
+    assert cards[name]["address"] == address
+
+
+def test_no_reviews_card_has_an_empty_rating(cards):
+    card = cards["Accesorios Garcia"]
+    assert card["rating"] == ""
+    assert card["phone"] == "01 4283311"
+    assert card["website"] == ""
+
+
+def test_missing_phone_and_website_are_empty(cards):
+    card = cards["Mundo Celular"]
+    assert card["phone"] == ""
+    assert card["website"] == ""
+    assert card["address"] == "Av. Abancay 455"
+    assert card["rating"] == "3.9"
+
+
+def test_card_fragments_parse_like_the_full_feed(feed_html):
+    # The scroll loop only fetches the cards added since the last pass
+    cards = parse_feed_html(feed_html)
+    fragment = feed_html.split("\n")
+    tail = "\n".join(
+        line for line in fragment if "Accesorios Garcia" in line
+        or "Smart Movil San Isidro" in line)
+    assert parse_feed_html(tail) == cards[-2:]
+    assert parse_feed_html("") == []
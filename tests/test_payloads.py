@@ -0,0 +1,87 @@
+import json
+
+from benchmarks.fakes import read_fixture
+from payloads import PAYLOAD_PREFIX, parse_search_payload, place_lead
+
+
+def place(name="Mundo Celular",
+          address="Av. Abancay 123, Lima 15001",
+          phone="01 426 1234",
+          website="https://mundocelular.pe/",
+          rating=4.3,
+          data_id="0x9105c8a3b7e1f0d5:0x8d2e6f4a1c3b7e90"):
+    values = [None] * 179
+    values[11] = name
+    values[39] = address
+    values[178] = [[phone]] if phone else None
+    values[7] = [website] if website else None
+    values[4] = [None] * 7 + [rating] if rating is not None else None
+    values[10] = data_id
+    return values
+
+
+def response(*places):
+    entries = [["shops", None]] + [[None] * 14 + [p] for p in places]
+    return PAYLOAD_PREFIX + "\n" + json.dumps([["shops", entries]])
+
+
+def test_place_lead_reads_every_field():
+    lead = place_lead(place())
+    assert lead == {
+        "name": "Mundo Celular",
+        "address": "Av. Abancay 123, Lima 15001",
+        "phone": "01 426 1234",
+        "website": "https://mundocelular.pe/",
+        "rating": "4.3",
+        "place_url": "https://www.google.com/maps/place/data=!4m2!3m1"
+        "!1s0x9105c8a3b7e1f0d5:0x8d2e6f4a1c3b7e90"
+    }
+
+
+def test_missing_fields_come_out_empty():
+    lead = place_lead(place(phone=None, website=None, rating=None,
+                            data_id=None))
+    assert lead["phone"] == lead["website"] == lead["rating"] == ""
+    assert lead["place_url"] == ""
+
+
+def test_address_falls_back_to_address_lines():
+    values = place(address=None)
+    values[2] = ["Av. Abancay 123", "Lima 15001"]
+    assert place_lead(values)["address"] == "Av. Abancay 123, Lima 15001"
+
+
+def test_redirected_website_is_unwrapped():
+    lead = place_lead(
+        place(website="/url?q=https://mundocelular.pe/&opi=79508299"))
+    assert lead["website"] == "https://mundocelular.pe/"
+
+
+def test_prefix_and_suffix_are_stripped():
+    text = response(place(), place(name="Tecno Max")) + '/*""*/'
+    assert [lead["name"] for lead in parse_search_payload(text)
+            ] == ["Mundo Celular", "Tecno Max"]
+
+
+def test_envelope_is_unwrapped():
+    text = json.dumps({"c": 0, "d": response(place())}) + '/*""*/'
+    assert [lead["name"] for lead in parse_search_payload(text)
+            ] == ["Mundo Celular"]
+
+
+def test_entries_without_a_place_are_skipped():
+    text = response(place()).replace('[["shops", null]', '[["shops", null], '
+                                     '[null, "ad"]', 1)
+    assert len(parse_search_payload(text)) == 1
+
+
+def test_garbage_returns_no_leads():
+    for text in ("", "not json", PAYLOAD_PREFIX, PAYLOAD_PREFIX + "[]",
+                 PAYLOAD_PREFIX + '{"d": 1}', '{"c": 0}', "[1, 2, 3]"):
+        assert parse_search_payload(text) == []
+
+
+def test_recorded_response():
+    leads = parse_search_payload(read_fixture("maps_search_payload.txt"))
+    assert len(leads) == 6
+    assert all(lead["name"] and lead["place_url"] for lead in leads)
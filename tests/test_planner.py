@@ -0,0 +1,67 @@
+from planner import Tile, TilePlanner
+
+ROOT = Tile(-12.25, -77.15, -11.90, -76.90)
+
+
+class FakeScrape:
+    """
+    Maps search stand-in: `capacity(url)` businesses per tile URL, named
+    after the URL unless `shared` makes every tile return the same ones.
+    """
+
+    def __init__(self, capacity, shared=False):
+        self.capacity = capacity
+        self.shared = shared
+        self.calls = []
+
+    def __call__(self, query, limit, start_url):
+        self.calls.append((limit, start_url))
+        prefix = "shop" if self.shared else start_url
+        return [{
+            "name": f"{prefix} {i}",
+            "address": ""
+        } for i in range(min(limit, self.capacity(start_url)))]
+
+
+def test_small_request_scrapes_only_what_it_needs():
+    scrape = FakeScrape(lambda url: 500)
+    leads, stats = TilePlanner(scrape, tile_limit=120).run("shops", ROOT, 20)
+    assert len(leads) == 20
+    assert [limit for limit, _ in scrape.calls] == [20]
+    assert stats["split"] == 0
+
+
+def test_full_tile_with_new_leads_is_split():
+    scrape = FakeScrape(lambda url: 500)
+    leads, stats = TilePlanner(scrape, tile_limit=120).run("shops", ROOT, 300)
+    assert len(leads) == 300
+    assert stats["split"] >= 1
+    assert stats["depth"] == 1
+    # The second round asks each quadrant for at most what is still needed
+    assert all(limit == 120 for limit, _ in scrape.calls[1:5])
+
+
+def test_tile_with_room_to_spare_is_not_split():
+    scrape = FakeScrape(lambda url: 50)
+    leads, stats = TilePlanner(scrape, tile_limit=120).run("shops", ROOT, 300)
+    assert len(leads) == 50
+    assert len(scrape.calls) == 1
+    assert stats["split"] == 0
+
+
+def test_full_tile_without_new_leads_is_not_split():
+    scrape = FakeScrape(lambda url: 500, shared=True)
+    leads, stats = TilePlanner(scrape, tile_limit=120).run("shops", ROOT, 300)
+    # The quadrants only repeat the root's businesses, so nothing splits
+    assert len(leads) == 120
+    assert stats["depth"] == 1
+    assert stats["new_by_depth"] == [120, 0]
+
+
+def test_splitting_stops_at_max_depth():
+    scrape = FakeScrape(lambda url: 500)
+    leads, stats = TilePlanner(scrape, tile_limit=10,
+                               max_depth=2).run("shops", ROOT, 10_000)
+    assert stats["depth"] == 2
+    assert stats["tiles"] == 1 + 4 + 16
+    assert len(leads) == 10 * 21
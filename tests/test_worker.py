@@ -0,0 +1,38 @@
+import threading
+import time
+
+from broker import MemoryBroker
+from worker import ScrapeWorker
+
+
+def test_hung_handler_loses_its_lease():
+    broker = MemoryBroker(lease=0.3, max_attempts=2)
+    task_id = broker.publish({"query": "shops"})
+    release = threading.Event()
+    worker = ScrapeWorker(broker,
+                          lambda payload: release.wait(),
+                          worker_id="hung",
+                          max_runtime=0.2)
+    thread = threading.Thread(target=worker.run_once, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.8)
+        task = broker.claim("other")
+        assert task["id"] == task_id
+        assert task["attempts"] == 2
+    finally:
+        release.set()
+        thread.join(5)
+    # The hung worker's late result no longer counts
+    assert worker.stats["lost"] == 1
+
+
+def test_lease_is_renewed_while_the_handler_runs():
+    broker = MemoryBroker(lease=0.3)
+    broker.publish({"query": "shops"})
+    worker = ScrapeWorker(broker,
+                          lambda payload: time.sleep(0.8) or "done",
+                          worker_id="slow",
+                          max_runtime=5)
+    worker.run_once()
+    assert worker.stats["completed"] == 1
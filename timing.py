@@ -0,0 +1,65 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Accumulate wall-clock time per named phase of a scrape run, and counts
+    of notable events such as selector misses.
+
+    An `observer` (a MetricsRegistry) also receives every phase duration as
+    the phase_seconds histogram and every count as a counter, so process
+    wide metrics and per-run summaries come from the same calls.
+    """
+
+    def __init__(self, observer=None):
+        self.started_at = time.perf_counter()
+        self.observer = observer
+        self._phases = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase, seconds):
+        with self._lock:
+            stats = self._phases.setdefault(phase, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+        if self.observer:
+            self.observer.observe("phase_seconds", seconds, phase=phase)
+
+    def count(self, event, amount=1, **labels):
+        key = ":".join([event] + [str(v) for v in labels.values()])
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + amount
+        if self.observer:
+            self.observer.inc(event, amount, **labels)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self):
+        with self._lock:
+            phases = {
+                name: {
+                    "count": count,
+                    "total": round(total, 3),
+                    "avg": round(total / count, 3),
+                    "max": round(longest, 3)
+                }
+                for name, (count, total, longest) in self._phases.items()
+            }
+            counts = dict(self._counts)
+        summary = {
+            "elapsed": round(time.perf_counter() - self.started_at, 3),
+            "phases": phases
+        }
+        if counts:
+            summary["counts"] = counts
+        return summary
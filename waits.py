@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from payloads import DRAIN_PAYLOADS_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+POLL_FREQUENCY = 0.1
+
+# Reports [card count, end-of-list reached] for the results feed
+FEED_STATE_SCRIPT = (
+    "var feed = document.querySelector('div[role=\"feed\"]');"
+    "if (!feed) return [0, false];"
+    "return [feed.querySelectorAll('div[role=\"article\"]').length,"
+    " !!feed.querySelector('span.HlvSq, div.lXJj5c')];")
+
+SEARCH_STATE_SCRIPT = (
+    "var feed = document.querySelector('div[role=\"feed\"]');"
+    "if (feed && feed.querySelector('div[role=\"article\"]')) return 'feed';"
+    "if (document.querySelector('h1.fontHeadlineLarge')) return 'place';"
+    "return false;")
+
+DETAIL_NAME_SCRIPT = (
+    "var h1 = document.querySelector('h1.fontHeadlineLarge');"
+    "return h1 ? h1.textContent : '';")
+
+SCROLL_FEED_SCRIPT = (
+    "var feed = document.querySelector('div[role=\"feed\"]');"
+    "feed.scrollTo(0, feed.scrollHeight);")
+
+FEED_VISIBLE_SCRIPT = (
+    "var feed = document.querySelector('div[role=\"feed\"]');"
+    "return !!(feed && feed.offsetParent"
+    " && !document.querySelector('h1.fontHeadlineLarge'));")
+
+
+class AdaptiveTimeout:
+    """
+    Per-phase wait timeouts that follow observed page latency.
+
+    Each phase keeps an exponentially weighted average of how long its
+    condition took to become true; the timeout is a multiple of that,
+    clamped to [minimum, maximum]. Timeouts count as slow observations so
+    a struggling page gets more room on the next wait.
+    """
+
+    def __init__(self,
+                 defaults,
+                 factor=3.0,
+                 minimum=1.0,
+                 maximum=30.0,
+                 alpha=0.3):
+        self.defaults = defaults
+        self.factor = factor
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self._averages = {}
+        self._lock = threading.Lock()
+
+    def get(self, phase):
+        with self._lock:
+            average = self._averages.get(phase)
+        if average is None:
+            return self.defaults.get(phase, self.maximum)
+        return min(self.maximum, max(self.minimum, average * self.factor))
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            average = self._averages.get(phase)
+            if average is None:
+                self._averages[phase] = seconds
+            else:
+                self._averages[phase] = (self.alpha * seconds +
+                                         (1 - self.alpha) * average)
+
+    def wait(self, driver, phase, condition, timer=None):
+        """Wait for `condition(driver)` to be truthy and learn from it."""
+        timeout = self.get(phase)
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(
+                driver, timeout,
+                poll_frequency=POLL_FREQUENCY).until(condition)
+        except TimeoutException:
+            logger.debug(f"Wait for {phase} timed out after {timeout:.1f}s")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(phase, elapsed)
+            if timer:
+                timer.record(f"wait_{phase}", elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            averages = dict(self._averages)
+        return {
+            phase: round(self.get(phase), 2)
+            for phase in set(self.defaults) | set(averages)
+        }
+
+
+def search_page_ready(driver):
+    """Either the cookie consent button or the search box is usable."""
+    buttons = driver.find_elements(By.XPATH,
+                                   "//button[contains(text(), 'Accept')]")
+    if buttons and buttons[0].is_displayed():
+        return ("consent", buttons[0])
+    boxes = driver.find_elements(By.ID, "searchboxinput")
+    if boxes and boxes[0].is_displayed() and boxes[0].is_enabled():
+        return ("search", boxes[0])
+    return False
+
+
+def search_results_loaded(driver):
+    """The search finished with a results feed or a single place page."""
+    return driver.execute_script(SEARCH_STATE_SCRIPT)
+
+
+def feed_grew(previous_count):
+    """The feed holds more cards than before, or reports the end of list."""
+
+    def condition(driver):
+        count, ended = driver.execute_script(FEED_STATE_SCRIPT)
+        if count > previous_count or ended:
+            return {"count": count, "ended": ended}
+        return False
+
+    return condition
+
+
+def detail_opened(previous_name):
+    """A detail panel is showing a different business than before."""
+
+    def condition(driver):
+        name = driver.execute_script(DETAIL_NAME_SCRIPT)
+        if name and name != previous_name:
+            return name
+        return False
+
+    return condition
+
+
+def feed_visible(driver):
+    """The detail panel is closed and the results feed is back on screen."""
+    return driver.execute_script(FEED_VISIBLE_SCRIPT)
+
+
+def payloads_arrived(driver):
+    """New search responses were captured, or the feed reached its end."""
+    payloads = driver.execute_script(DRAIN_PAYLOADS_SCRIPT)
+    if payloads:
+        return {"payloads": payloads, "ended": False}
+    count, ended = driver.execute_script(FEED_STATE_SCRIPT)
+    if ended:
+        return {"payloads": [], "ended": True}
+    return False
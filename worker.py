@@ -0,0 +1,160 @@
+"""
+Scrape worker: claims scrape tasks from the broker and runs them on this
+node's browsers.
+
+Start as many as the node has room for Chrome instances. A SQLite broker
+is shared by processes on one host only; workers on other machines need
+a Postgres broker they can reach:
+    BROKER_URL=sqlite:////var/lib/leads/broker.db python worker.py
+    BROKER_URL=postgresql://user:password@db/leads python worker.py --threads 2
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeWorker:
+    """
+    Claim tasks from `broker` and run `handler(payload)` on each.
+
+    The task's lease is renewed every third of the lease period while the
+    handler runs, but for no more than `max_runtime` seconds: after that
+    a hung handler lets its lease expire, and the task goes back to the
+    broker to be retried or failed. Handler errors hand the task back for
+    a retry.
+    """
+
+    def __init__(self,
+                 broker,
+                 handler,
+                 worker_id=None,
+                 poll_interval=1.0,
+                 max_runtime=None):
+        self.broker = broker
+        self.handler = handler
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}")
+        self.poll_interval = poll_interval
+        self.max_runtime = max_runtime
+        self.stats = {"completed": 0, "failed": 0, "lost": 0}
+
+    def _keep_lease(self, task_id, done):
+        started = time.monotonic()
+        while not done.wait(self.broker.lease / 3):
+            if (self.max_runtime is not None
+                    and time.monotonic() - started > self.max_runtime):
+                logger.warning(f"Task {task_id} ran past {self.max_runtime}s;"
+                               f" letting its lease expire")
+                return
+            if not self.broker.renew(task_id, self.worker_id):
+                logger.warning(f"Lost the lease on task {task_id}")
+                return
+
+    def run_once(self):
+        """Run one task if there is one; returns whether there was."""
+        task = self.broker.claim(self.worker_id)
+        if not task:
+            return False
+
+        logger.info(f"Worker {self.worker_id} running task {task['id']} "
+                    f"(shard {task['shard']}, attempt {task['attempts']})")
+        done = threading.Event()
+        threading.Thread(target=self._keep_lease,
+                         args=(task["id"], done),
+                         name="lease-renewal",
+                         daemon=True).start()
+        try:
+            result = self.handler(task["payload"])
+        except Exception as e:
+            logger.error(f"Task {task['id']} failed: {str(e)}")
+            self.broker.fail(task["id"], self.worker_id, e)
+            self.stats["failed"] += 1
+            return True
+        finally:
+            done.set()
+
+        if self.broker.complete(task["id"], self.worker_id, result):
+            self.stats["completed"] += 1
+        else:
+            # The lease ran out and the task went to another worker
+            self.stats["lost"] += 1
+        return True
+
+    def run(self, stop):
+        """Work until the `stop` event is set."""
+        while not stop.is_set():
+            try:
+                if not self.run_once():
+                    stop.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} error: {str(e)}")
+                stop.wait(self.poll_interval)
+
+
+def start_workers(broker,
+                  handler,
+                  count,
+                  stop,
+                  name="scrape-worker",
+                  max_runtime=None):
+    """Run `count` ScrapeWorkers on daemon threads until `stop` is set."""
+    threads = []
+    for index in range(count):
+        worker = ScrapeWorker(
+            broker,
+            handler,
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}",
+            max_runtime=max_runtime)
+        thread = threading.Thread(target=worker.run,
+                                  args=(stop, ),
+                                  name=f"{name}-{index}",
+                                  daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--broker", default=os.environ.get("BROKER_URL"))
+    parser.add_argument("--threads",
+                        type=int,
+                        default=int(os.environ.get("DRIVER_POOL_SIZE", 2)))
+    args = parser.parse_args()
+    if not args.broker or args.broker.startswith("memory:"):
+        parser.error("a shared broker URL is required, e.g. "
+                     "postgresql://user:password@db/leads")
+
+    # The app's own workers are not wanted here, only its scraper
+    os.environ["BROKER_URL"] = args.broker
+    os.environ["BROKER_LOCAL_WORKERS"] = "0"
+    os.environ.setdefault("DRIVER_POOL_SIZE", str(args.threads))
+    import app
+    app.warm_up_browsers()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    threads = start_workers(app.broker,
+                            app.run_scrape_task,
+                            args.threads,
+                            stop,
+                            max_runtime=app.BROKER_TASK_TIMEOUT)
+    logger.info(f"Started {len(threads)} scrape workers on {args.broker}")
+    stop.wait()
+    logger.info("Stopping; running tasks finish or their leases expire")
+    for thread in threads:
+        thread.join()
+    app.driver_pool.close()
+
+
+if __name__ == "__main__":
+    main()